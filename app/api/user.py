@@ -1,22 +1,23 @@
 from fastapi import APIRouter, Depends
+from typing import Dict, Any
 from app.services.user_service import get_user, update_user, delete_user
-from app.core.security import get_current_user
+from app.api.v1.dependencies import get_current_user
 
 router = APIRouter()
 
 @router.get("/profile")
-def get_profile(user_id: str = Depends(get_current_user)):
-    user = get_user(user_id)
-    if user:
-        return user
+async def get_profile(user: Dict[str, Any] = Depends(get_current_user)):
+    profile = await get_user(user["uid"])
+    if profile:
+        return profile
     return {"error": "User not found"}
 
 @router.put("/profile")
-def update_profile(user_data: dict, user_id: str = Depends(get_current_user)):
-    update_user(user_id, user_data)
+async def update_profile(user_data: dict, user: Dict[str, Any] = Depends(get_current_user)):
+    await update_user(user["uid"], user_data)
     return {"message": "Profile updated"}
 
 @router.delete("/account")
-def delete_account(user_id: str = Depends(get_current_user)):
-    delete_user(user_id)
+async def delete_account(user: Dict[str, Any] = Depends(get_current_user)):
+    await delete_user(user["uid"])
     return {"message": "Account deleted"}
\ No newline at end of file
@@ -1,8 +1,8 @@
 from typing import Dict, Any
 from fastapi import Depends, HTTPException
-from app.core.security.firebase_auth import verify_firebase_token
+from app.core.security.session import verify_token
 
-async def get_current_user(token_data: Dict[str, Any] = Depends(verify_firebase_token)) -> Dict[str, Any]:
+async def get_current_user(token_data: Dict[str, Any] = Depends(verify_token)) -> Dict[str, Any]:
     """Common dependency for getting authenticated user data"""
     return token_data
 
@@ -1,9 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, Security
+from fastapi.responses import PlainTextResponse
 from fastapi.security import HTTPAuthorizationCredentials
+from app.api.v1.dependencies import get_admin_user
+from app.core.diagnostics.loop_monitor import loop_monitor
+from app.core.diagnostics.profiler import profile_store
 from app.core.security.firebase_auth import verify_firebase_token
+from app.core.security.session import create_session_tokens, refresh_session_tokens, verify_token
 from app.tools.image_captioning.router import router as image_captioning_router
-from typing import Dict, Any
-from .schemas import HealthResponse, ProtectedResponse, AdminResponse
+from typing import Dict, Any, List
+from .schemas import (
+    HealthResponse, ProtectedResponse, AdminResponse,
+    SessionTokenResponse, RefreshTokenRequest,
+    LoopStall, ProfileSummary, Profile
+)
 # from .security import security_scheme
 
 api_router = APIRouter(
@@ -48,7 +57,7 @@ async def health_check():
 )
 async def protected_route(
     # auth: HTTPAuthorizationCredentials = Security(security_scheme),
-    token_data: Dict[str, Any] = Depends(verify_firebase_token)
+    token_data: Dict[str, Any] = Depends(verify_token)
 ):
     """Protected endpoint that requires a valid Firebase token."""
     return {
@@ -77,12 +86,79 @@ async def protected_route(
 )
 async def admin_route(
     # auth: HTTPAuthorizationCredentials = Security(security_scheme),
-    token_data: Dict[str, Any] = Depends(verify_firebase_token)
+    token_data: Dict[str, Any] = Depends(verify_token)
 ):
     """Admin-only endpoint that requires a valid Firebase token with admin claim."""
     if not token_data.get("admin", False):
         raise HTTPException(status_code=403, detail="Admin access required")
     return {"message": "Admin route accessed"}
 
+@api_router.post(
+    "/auth/token",
+    response_model=SessionTokenResponse,
+    summary="Exchange Token",
+    description="Exchange a Firebase ID token for short-lived session tokens",
+    responses={401: {"description": "Invalid or missing Firebase ID token"}}
+)
+async def exchange_token(token_data: Dict[str, Any] = Depends(verify_firebase_token)):
+    """Verifies the Firebase ID token once and issues local session tokens."""
+    return create_session_tokens(token_data)
+
+@api_router.post(
+    "/auth/refresh",
+    response_model=SessionTokenResponse,
+    summary="Refresh Token",
+    description="Issue new session tokens from a refresh token",
+    responses={401: {"description": "Invalid or expired refresh token, or the user was disabled or revoked"}}
+)
+async def refresh_token(request: RefreshTokenRequest):
+    """Rotates the session token pair after re-checking the user with Firebase."""
+    return await refresh_session_tokens(request.refresh_token)
+
+@api_router.get(
+    "/diagnostics/stalls",
+    response_model=List[LoopStall],
+    summary="Event Loop Stalls",
+    description="Recent event loop stalls of all workers with the stack that was blocking",
+    responses={403: {"description": "User does not have admin privileges"}}
+)
+async def list_loop_stalls(user: Dict[str, Any] = Depends(get_admin_user)):
+    """Returns the most recent stalls seen by the loop lag monitor."""
+    return await loop_monitor.recent_stalls()
+
+@api_router.get(
+    "/diagnostics/profiles",
+    response_model=List[ProfileSummary],
+    summary="Request Profiles",
+    description="Profiles captured with the X-Profile header, newest first",
+    responses={403: {"description": "User does not have admin privileges"}}
+)
+async def list_profiles(user: Dict[str, Any] = Depends(get_admin_user)):
+    """Lists stored request profiles without their samples."""
+    return await profile_store.list()
+
+@api_router.get(
+    "/diagnostics/profiles/{profile_id}",
+    response_model=Profile,
+    summary="Request Profile",
+    description="A request profile as folded stacks; use ?format=folded for flamegraph input",
+    responses={
+        403: {"description": "User does not have admin privileges"},
+        404: {"description": "Profile not found or evicted"}
+    }
+)
+async def get_profile(
+    profile_id: str,
+    format: str = "json",
+    user: Dict[str, Any] = Depends(get_admin_user)
+):
+    """Returns one request profile."""
+    profile = await profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "folded":
+        return PlainTextResponse("\n".join(profile["folded"]) + "\n")
+    return profile
+
 # Include tool routers
 api_router.include_router(image_captioning_router, prefix="/tools")
\ No newline at end of file
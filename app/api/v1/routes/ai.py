@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi import APIRouter, Depends, HTTPException, Body, Request, Response
 from typing import Dict, Any, Optional, List
 from app.services.ai_service import AIService
-from app.core.security.firebase_auth import verify_firebase_token
+from app.core.security.session import verify_token
 from app.shared.utils.decorators.auth_decorator import require_auth, rate_limit
 from pydantic import BaseModel
 
@@ -34,7 +34,9 @@ class SearchRequest(BaseModel):
 @rate_limit(requests=30, period=60)
 async def analyze_text(
     request: TextAnalysisRequest,
-    token_data: Dict[str, Any] = Depends(verify_firebase_token)
+    http_request: Request,
+    response: Response,
+    token_data: Dict[str, Any] = Depends(verify_token)
 ) -> Dict[str, Any]:
     """Analyze text with context from ChromaDB"""
     try:
@@ -52,7 +54,9 @@ async def analyze_text(
 @rate_limit(requests=20, period=60)
 async def get_recommendations(
     request: ProductRecommendationRequest,
-    token_data: Dict[str, Any] = Depends(verify_firebase_token)
+    http_request: Request,
+    response: Response,
+    token_data: Dict[str, Any] = Depends(verify_token)
 ) -> Dict[str, Any]:
     """Get personalized product recommendations"""
     try:
@@ -68,7 +72,9 @@ async def get_recommendations(
 @rate_limit(requests=50, period=60)
 async def process_document(
     request: DocumentRequest,
-    token_data: Dict[str, Any] = Depends(verify_firebase_token)
+    http_request: Request,
+    response: Response,
+    token_data: Dict[str, Any] = Depends(verify_token)
 ) -> Dict[str, Any]:
     """Store and analyze document"""
     try:
@@ -85,7 +91,9 @@ async def process_document(
 @rate_limit(requests=50, period=60)
 async def semantic_search(
     request: SearchRequest,
-    token_data: Dict[str, Any] = Depends(verify_firebase_token)
+    http_request: Request,
+    response: Response,
+    token_data: Dict[str, Any] = Depends(verify_token)
 ) -> Dict[str, Any]:
     """Perform semantic search with optional reranking"""
     try:
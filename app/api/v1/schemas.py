@@ -1,3 +1,4 @@
+from typing import List, Optional
 from pydantic import BaseModel
 
 class HealthResponse(BaseModel):
@@ -9,4 +10,33 @@ class ProtectedResponse(BaseModel):
     email: str | None
 
 class AdminResponse(BaseModel):
-    message: str
\ No newline at end of file
+    message: str
+
+class SessionTokenResponse(BaseModel):
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+    expires_in: int
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
+
+class LoopStall(BaseModel):
+    worker: int
+    detected_at: float
+    duration_ms: Optional[float]
+    stack: Optional[str]
+
+class ProfileSummary(BaseModel):
+    id: str
+    worker: int
+    method: str
+    path: str
+    user_id: Optional[str]
+    created_at: float
+    duration_ms: float
+    interval_ms: float
+    samples: int
+
+class Profile(ProfileSummary):
+    folded: List[str]
@@ -19,6 +19,7 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    SESSION_MAX_AGE_DAYS: int = 30  # absolute limit from token exchange, refreshes included
     
     # Firebase
     FIREBASE_PROJECT_ID: str
@@ -27,6 +28,7 @@ class Settings(BaseSettings):
     FIREBASE_CLIENT_EMAIL: str
     FIREBASE_CLIENT_ID: str
     FIREBASE_CREDENTIALS_PATH: Optional[str] = None
+    FIREBASE_TOKEN_CACHE_SIZE: int = 10000
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
@@ -39,10 +41,37 @@ class Settings(BaseSettings):
     UPLOAD_DIR: str = "./uploads"
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
     ALLOWED_EXTENSIONS: List[str] = ["pdf", "txt", "doc", "docx"]
+    STORAGE_BACKEND: str = "local"  # "local" or "gcs"
+    STORAGE_MAX_BYTES: int = 10 * 1024 * 1024 * 1024  # 10GB, 0 disables the quota
+    STORAGE_TTL_SECONDS: int = 0  # 0 keeps objects until the quota evicts them
+    STORAGE_EVICTION_INTERVAL: int = 3600
+    GCS_BUCKET_NAME: Optional[str] = None
+    GCS_UPLOAD_CHUNK_SIZE: int = 8 * 1024 * 1024  # must be a multiple of 256KB
     
     # Hugging Face
     HUGGINGFACE_API_KEY: str
     HUGGINGFACE_MODEL_CACHE: str = "./model_cache"
+    HUGGINGFACE_WARMUP_ENABLED: bool = True
+    HUGGINGFACE_WARMUP_MODELS: List[str] = ["Salesforce/blip-image-captioning-large"]
+    HUGGINGFACE_WARMUP_INTERVAL: int = 300
+    
+    # Image Captioning
+    IMAGE_CAPTIONING_MODEL: str = "Salesforce/blip-image-captioning-large"
+    IMAGE_CAPTIONING_BACKEND: str = "hosted"  # "hosted" (HF Inference API) or "local" (ONNX)
+    IMAGE_CAPTION_CACHE_TTL: int = 30 * 24 * 3600  # 30 days
+    IMAGE_MAX_DIMENSION: int = 512
+    IMAGE_JPEG_QUALITY: int = 90
+    IMAGE_PREPROCESS_WORKERS: int = 4
+    IMAGE_CAPTIONING_BATCH_CONCURRENCY: int = 4
+    IMAGE_CAPTIONING_BATCH_MAX_ITEMS: int = 200
+    
+    # Local ONNX Inference
+    ONNX_CAPTIONING_MODEL_DIR: str = "./model_cache/blip-image-captioning-large-onnx"
+    ONNX_NUM_WORKERS: int = 1
+    ONNX_INTRA_OP_THREADS: int = 0
+    ONNX_MAX_BATCH_SIZE: int = 8
+    ONNX_MAX_BATCH_WAIT_MS: int = 10
+    ONNX_MAX_CAPTION_LENGTH: int = 30
     
     # Anthropic Claude
     ANTHROPIC_API_KEY: str
@@ -68,9 +97,25 @@ class Settings(BaseSettings):
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_QUEUE_OVERFLOW: str = "drop_new"  # "drop_new", "drop_oldest" or "block"
+    LOG_SUCCESS_SAMPLE_RATE: float = 0.1  # errors and slow calls are always logged
+    LOG_SLOW_CALL_MS: int = 1000
+    LOG_MAX_PAYLOAD_CHARS: int = 1000
     SENTRY_DSN: Optional[str] = None
     SENTRY_ENVIRONMENT: Optional[str] = None
     
+    # Tracing
+    OTEL_EXPORTER_OTLP_ENDPOINT: Optional[str] = None  # e.g. http://otel-collector:4317
+    OTEL_SAMPLE_RATIO: float = 0.1
+
+    # Diagnostics
+    LOOP_LAG_INTERVAL_MS: int = 100
+    LOOP_LAG_THRESHOLD_MS: int = 250
+    PROFILER_SAMPLE_INTERVAL_MS: float = 5.0
+    PROFILER_MAX_PROFILES: int = 20
+    DIAGNOSTICS_TTL: int = 86400  # how long stalls and profiles are kept in Redis
+    
     # CORS
     CORS_ORIGINS: List[str] = ["http://localhost:3000"]
     CORS_ALLOW_CREDENTIALS: bool = True
@@ -81,20 +126,44 @@ class Settings(BaseSettings):
     RATE_LIMIT_PER_MINUTE: int = 60
     RATE_LIMIT_BURST: int = 5
     RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_MODE: str = "redis"  # "redis" (exact) or "hybrid" (local leases + Redis)
+    RATE_LIMIT_LEASE_SIZE: int = 20
+    RATE_LIMIT_LEASE_TTL: Optional[float] = None  # default: time the bucket takes to refill a lease
+    RATE_LIMIT_SYNC_INTERVAL: float = 1.0
     
     # Feature Flags
     ENABLE_AI_FEATURES: bool = True
     ENABLE_CACHING: bool = True
     ENABLE_METRICS: bool = True
+    ENABLE_TRACING: bool = True
+    ENABLE_LOOP_MONITOR: bool = True
+    ENABLE_PROFILER: bool = True
     
     # Performance
     REQUEST_TIMEOUT: int = 30
     MAX_WORKERS: int = 4
     KEEP_ALIVE: int = 5
+    REPOSITORY_PAGE_SIZE: int = 100
+    REPOSITORY_MAX_PAGE_SIZE: int = 1000
+    FIRESTORE_BATCH_SIZE: int = 500  # Firestore's per-batch write limit
+    FIRESTORE_BULK_CONCURRENCY: int = 8
+    FIRESTORE_BULK_RETRIES: int = 3
+    FIRESTORE_BULK_REPLAY_CONCURRENCY: int = 10  # writes replayed one by one after a batch fails
+    COUNTER_NUM_SHARDS: int = 10  # each shard sustains ~1 write/second
+    COUNTER_CACHE_TTL: float = 5.0
     
     # Cache Settings
     CACHE_TTL: int = 3600
     CACHE_PREFIX: str = "addressed:"
+    USER_CACHE_SIZE: int = 10000
+    USER_CACHE_LOCAL_TTL: int = 30  # bounds staleness across workers
+    USER_CACHE_TTL: int = 3600
+    USER_CACHE_NEGATIVE_TTL: int = 60
+    AGGREGATE_CACHE_SIZE: int = 1024
+    AGGREGATE_CACHE_TTL: int = 300
+    QUERY_CACHE_SIZE: int = 10000
+    QUERY_CACHE_LOCAL_TTL: int = 30  # also bounds staleness if an invalidation is missed
+    QUERY_CACHE_GENERATION_TTL: int = 7 * 24 * 3600
     
     class Config:
         env_file = ".env"
@@ -131,6 +200,21 @@ class Settings(BaseSettings):
             
         if self.ENVIRONMENT not in ["development", "staging", "production"]:
             raise ValueError("Invalid ENVIRONMENT value")
+            
+        if self.IMAGE_CAPTIONING_BACKEND not in ["hosted", "local"]:
+            raise ValueError("Invalid IMAGE_CAPTIONING_BACKEND value")
+            
+        if self.RATE_LIMIT_MODE not in ["redis", "hybrid"]:
+            raise ValueError("Invalid RATE_LIMIT_MODE value")
+            
+        if self.LOG_QUEUE_OVERFLOW not in ["drop_new", "drop_oldest", "block"]:
+            raise ValueError("Invalid LOG_QUEUE_OVERFLOW value")
+            
+        if self.STORAGE_BACKEND not in ["local", "gcs"]:
+            raise ValueError("Invalid STORAGE_BACKEND value")
+            
+        if self.STORAGE_BACKEND == "gcs" and not self.GCS_BUCKET_NAME:
+            raise ValueError("GCS_BUCKET_NAME must be set when STORAGE_BACKEND is gcs")
 
 @lru_cache()
 def get_settings() -> Settings:
@@ -0,0 +1,161 @@
+# app/core/diagnostics/loop_monitor.py
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+from app.core.config.settings import get_settings
+from app.core.logging.logging_config import logger
+from app.core.metrics.prometheus import EVENT_LOOP_LAG, EVENT_LOOP_STALLS
+from app.infrastructure.database.redis.client import redis_client
+from app.shared.utils.serialization import dumps, loads
+
+settings = get_settings()
+
+class LoopLagMonitor:
+    """
+    Detects event loop stalls and captures what was blocking
+
+    A heartbeat task on the loop measures how late each wake-up is and
+    exports it as a gauge. A watchdog thread notices when the heartbeat stops
+    and grabs the loop thread's stack while it is still stuck, which points
+    at the blocking call. Finished stalls are pushed to a Redis list shared by
+    all workers, tagged with the worker's pid.
+    """
+
+    def __init__(
+        self,
+        interval_ms: Optional[int] = None,
+        threshold_ms: Optional[int] = None,
+        max_stalls: int = 50
+    ):
+        self.interval = (interval_ms or settings.LOOP_LAG_INTERVAL_MS) / 1000
+        self.threshold = (threshold_ms or settings.LOOP_LAG_THRESHOLD_MS) / 1000
+        self.max_stalls = max_stalls
+        # This worker's stalls, served when Redis is unavailable
+        self.stalls: Deque[Dict[str, Any]] = deque(maxlen=max_stalls)
+        self._stalls_key = f"{settings.CACHE_PREFIX}diagnostics:stalls"
+        # Guards _last_beat and _current_stall between heartbeat and watchdog
+        self._lock = threading.Lock()
+        self._last_beat = time.monotonic()
+        self._current_stall: Optional[Dict[str, Any]] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._heartbeat(), name="loop-lag-heartbeat")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stopping.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._watchdog.join(timeout=1)
+        self._watchdog = None
+
+    async def recent_stalls(self) -> List[Dict[str, Any]]:
+        """Newest stalls of every worker, or of this worker if Redis is down"""
+        try:
+            payloads = await redis_client.client.lrange(self._stalls_key, 0, -1)
+        except Exception as e:
+            logger.warning(f"Failed to read loop stalls: {str(e)}")
+            return list(reversed(self.stalls))
+        return [loads(payload) for payload in payloads]
+
+    async def _heartbeat(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            with self._lock:
+                self._last_beat = now
+                stall, self._current_stall = self._current_stall, None
+            EVENT_LOOP_LAG.set(lag)
+
+            if stall is not None:
+                # The watchdog caught this stall; record how long it lasted
+                stall["duration_ms"] = round(lag * 1000, 1)
+                logger.warning(
+                    f"Event loop was blocked for {stall['duration_ms']}ms",
+                    extra={"loop_lag_ms": stall["duration_ms"]}
+                )
+            elif lag >= self.threshold:
+                # Shorter than a watchdog tick; no stack, but still counted
+                EVENT_LOOP_STALLS.inc()
+                stall = self._new_stall(None)
+                stall["duration_ms"] = round(lag * 1000, 1)
+            else:
+                continue
+
+            self.stalls.append(stall)
+            await self._publish(stall)
+
+    async def _publish(self, stall: Dict[str, Any]) -> None:
+        try:
+            async with redis_client.pipeline(transaction=True) as pipe:
+                pipe.lpush(self._stalls_key, dumps(stall))
+                pipe.ltrim(self._stalls_key, 0, self.max_stalls - 1)
+                pipe.expire(self._stalls_key, settings.DIAGNOSTICS_TTL)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to store loop stall: {str(e)}")
+
+    def _new_stall(self, stack: Optional[str]) -> Dict[str, Any]:
+        return {
+            "worker": os.getpid(),
+            "detected_at": time.time(),
+            "duration_ms": None,
+            "stack": stack
+        }
+
+    def _watch(self) -> None:
+        while not self._stopping.wait(self.threshold / 2):
+            with self._lock:
+                last_beat = self._last_beat
+                stalled = self._current_stall is None
+            blocked_for = time.monotonic() - last_beat - self.interval
+            if blocked_for < self.threshold or not stalled:
+                continue
+
+            stall = self._new_stall(self._loop_stack())
+            with self._lock:
+                # The heartbeat may have run since; then this was not a stall
+                if self._last_beat != last_beat or self._current_stall is not None:
+                    continue
+                self._current_stall = stall
+
+            EVENT_LOOP_STALLS.inc()
+            logger.warning(
+                f"Event loop blocked for over {int(blocked_for * 1000)}ms, "
+                f"loop thread stack:\n{stall['stack'] or '<unavailable>'}",
+                extra={"loop_lag_ms": int(blocked_for * 1000)}
+            )
+
+    def _loop_stack(self) -> Optional[str]:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return None
+        # Line numbers are read now, while the loop is still stuck
+        summary = traceback.StackSummary.extract(traceback.walk_stack(frame), lookup_lines=False)
+        summary.reverse()
+        return "".join(summary.format())
+
+loop_monitor = LoopLagMonitor()
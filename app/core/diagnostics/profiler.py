@@ -0,0 +1,127 @@
+# app/core/diagnostics/profiler.py
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Any, Dict, List, Optional
+from app.core.config.settings import get_settings
+from app.core.logging.logging_config import logger
+from app.infrastructure.database.redis.client import redis_client
+from app.shared.utils.serialization import dumps, loads
+
+settings = get_settings()
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-ID"
+
+class SamplingProfiler:
+    """
+    Samples a thread's stack at a fixed interval into folded stacks
+
+    The output is the "frame;frame;frame count" format accepted by
+    flamegraph.pl and speedscope. Only the loop thread is sampled, so work
+    from other requests running concurrently shows up too.
+    """
+
+    def __init__(self, thread_id: int, interval_ms: Optional[float] = None, max_depth: int = 64):
+        self.thread_id = thread_id
+        self.interval = (interval_ms or settings.PROFILER_SAMPLE_INTERVAL_MS) / 1000
+        self.max_depth = max_depth
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+        self.duration = 0.0
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self._started
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None and len(names) < self.max_depth:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+            self.samples += 1
+
+    def folded(self) -> List[str]:
+        return [f"{stack} {count}" for stack, count in self.stacks.most_common()]
+
+class ProfileStore:
+    """
+    Finished request profiles, shared by every worker through Redis
+
+    A profile is usually fetched from a different worker than the one that
+    recorded it, so profiles live in Redis for DIAGNOSTICS_TTL seconds and
+    an index keeps the newest PROFILER_MAX_PROFILES of them.
+    """
+
+    def __init__(self, max_profiles: Optional[int] = None, ttl: Optional[int] = None):
+        self.max_profiles = max_profiles or settings.PROFILER_MAX_PROFILES
+        self.ttl = ttl or settings.DIAGNOSTICS_TTL
+        self._index_key = f"{settings.CACHE_PREFIX}diagnostics:profiles"
+        # Only one profiler samples at a time per worker to bound the overhead
+        self._active = threading.Lock()
+
+    def try_begin(self) -> bool:
+        return self._active.acquire(blocking=False)
+
+    def end(self) -> None:
+        self._active.release()
+
+    async def add(self, method: str, path: str, user_id: Optional[str], profiler: SamplingProfiler) -> str:
+        profile_id = uuid.uuid4().hex
+        profile = {
+            "id": profile_id,
+            "worker": os.getpid(),
+            "method": method,
+            "path": path,
+            "user_id": user_id,
+            "created_at": time.time(),
+            "duration_ms": round(profiler.duration * 1000, 1),
+            "interval_ms": profiler.interval * 1000,
+            "samples": profiler.samples,
+            "folded": profiler.folded()
+        }
+        try:
+            async with redis_client.pipeline(transaction=True) as pipe:
+                pipe.set(self._profile_key(profile_id), dumps(profile), ex=self.ttl)
+                pipe.zadd(self._index_key, {profile_id: profile["created_at"]})
+                pipe.zremrangebyrank(self._index_key, 0, -self.max_profiles - 1)
+                pipe.expire(self._index_key, self.ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to store profile {profile_id}: {str(e)}")
+        return profile_id
+
+    async def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        payload = await redis_client.get(self._profile_key(profile_id))
+        return loads(payload) if payload else None
+
+    async def list(self) -> List[Dict[str, Any]]:
+        profile_ids = await redis_client.client.zrevrange(self._index_key, 0, -1)
+        payloads = await redis_client.get_many([self._profile_key(profile_id.decode()) for profile_id in profile_ids])
+        return [
+            {key: value for key, value in loads(payload).items() if key != "folded"}
+            for payload in payloads if payload
+        ]
+
+    def _profile_key(self, profile_id: str) -> str:
+        return f"{settings.CACHE_PREFIX}diagnostics:profile:{profile_id}"
+
+profile_store = ProfileStore()
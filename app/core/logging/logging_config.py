@@ -1,10 +1,16 @@
+import atexit
+import copy
 import logging
 import logging.config
-import json
+import logging.handlers
+import queue
 from datetime import datetime
 from pathlib import Path
 import os
-from typing import Any, Dict
+from typing import Any, Dict, List
+from app.core.config.settings import get_settings
+from app.core.tracing.context import current_trace_ids, request_id_var
+from app.shared.utils.serialization import dumps_str
 
 # Create logs directory if it doesn't exist
 logs_dir = Path("logs")
@@ -19,7 +25,10 @@ class CustomJsonFormatter(logging.Formatter):
             "message": record.getMessage(),
             "module": record.module,
             "function": record.funcName,
-            "line": record.lineno
+            "line": record.lineno,
+            "request_id": getattr(record, "request_id", None),
+            "trace_id": getattr(record, "trace_id", None),
+            "span_id": getattr(record, "span_id", None)
         }
 
         # Add extra fields if they exist
@@ -29,15 +38,88 @@ class CustomJsonFormatter(logging.Formatter):
         # Add exception info if present
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            log_data["exception"] = record.exc_text
 
-        return json.dumps(log_data)
+        return dumps_str(log_data)
 
 class RequestIdFilter(logging.Filter):
-    """Filter to add request ID to log records"""
+    """Filter to add request and trace IDs to log records
+
+    Runs on the logging thread before records are queued, while the request's
+    context is still current; values already set on a record are kept.
+    """
     def filter(self, record):
-        record.request_id = getattr(record, "request_id", "no_request_id")
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_var.get()
+        if not hasattr(record, "trace_id"):
+            record.trace_id, record.span_id = current_trace_ids()
         return True
 
+_exception_formatter = logging.Formatter()
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to the background listener without blocking the caller
+
+    Records are tagged with the handlers of the logger they came from, so one
+    queue and one listener thread serve every logger. When the queue is full
+    the overflow policy applies: "drop_new" discards the record, "drop_oldest"
+    evicts the oldest queued record and "block" waits for space.
+    """
+    def __init__(self, log_queue: queue.Queue, targets: List[logging.Handler], overflow: str = "drop_new"):
+        super().__init__(log_queue)
+        self.targets = targets
+        self.overflow = overflow
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message and traceback now; args and frames may change or
+        # be freed before the listener gets to the record
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        record.log_targets = self.targets
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+
+        if self.overflow == "block":
+            self.queue.put(record)
+            return
+
+        if self.overflow == "drop_oldest":
+            try:
+                self.queue.get_nowait()
+                self.queue.put_nowait(record)
+            except (queue.Empty, queue.Full):
+                pass
+        self.dropped += 1
+
+class RoutingQueueListener(logging.handlers.QueueListener):
+    """Writes queued records to the handlers of their originating logger"""
+    def handle(self, record: logging.LogRecord) -> None:
+        record = self.prepare(record)
+        for handler in getattr(record, "log_targets", self.handlers):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            super().stop()
+
+    def enqueue_sentinel(self) -> None:
+        # Never drop the stop signal, even when the queue is full
+        self.queue.put(self._sentinel)
+
 LOGGING_CONFIG = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -102,8 +184,33 @@ LOGGING_CONFIG = {
     }
 }
 
+def setup_queue_logging(logger_names: List[str]) -> RoutingQueueListener:
+    """Move the configured handlers of each logger behind a shared queue
+
+    Formatting and disk/console I/O (including file rotation) then run on the
+    listener thread instead of the event loop.
+    """
+    settings = get_settings()
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    overflow = settings.LOG_QUEUE_OVERFLOW
+    handlers: List[logging.Handler] = []
+
+    for name in logger_names:
+        target_logger = logging.getLogger(name)
+        targets = list(target_logger.handlers)
+        queue_handler = BoundedQueueHandler(log_queue, targets, overflow)
+        queue_handler.addFilter(RequestIdFilter())
+        target_logger.handlers = [queue_handler]
+        handlers.extend(handler for handler in targets if handler not in handlers)
+
+    listener = RoutingQueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
 # Initialize logging configuration
 logging.config.dictConfig(LOGGING_CONFIG)
+log_listener = setup_queue_logging(list(LOGGING_CONFIG["loggers"]))
 logger = logging.getLogger("app")
 
 def get_logger(name: str) -> logging.Logger:
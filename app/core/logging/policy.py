@@ -0,0 +1,49 @@
+# app/core/logging/policy.py
+import logging
+import random
+import reprlib
+from typing import Any, Optional
+from app.core.config.settings import get_settings
+
+settings = get_settings()
+
+# Bounds how much of a payload is walked, not just how much is printed
+_repr = reprlib.Repr()
+_repr.maxlevel = 3
+_repr.maxlist = _repr.maxtuple = _repr.maxset = _repr.maxdict = 10
+_repr.maxstring = _repr.maxother = 200
+
+class CappedRepr:
+    """Size-capped repr of a payload, built only if the record is formatted"""
+
+    __slots__ = ("obj", "max_chars")
+
+    def __init__(self, obj: Any, max_chars: Optional[int] = None):
+        self.obj = obj
+        self.max_chars = max_chars or settings.LOG_MAX_PAYLOAD_CHARS
+
+    def __str__(self) -> str:
+        text = _repr.repr(self.obj)
+        if len(text) > self.max_chars:
+            return text[:self.max_chars - 3] + "..."
+        return text
+
+    __repr__ = __str__
+
+def log_success(logger: logging.Logger, message: str, duration_ms: float, **extra: Any) -> None:
+    """Log a successful call; slow calls always, the rest sampled"""
+    slow = duration_ms >= settings.LOG_SLOW_CALL_MS
+    level = logging.WARNING if slow else logging.INFO
+    if not logger.isEnabledFor(level):
+        return
+    if not slow and random.random() >= settings.LOG_SUCCESS_SAMPLE_RATE:
+        return
+    logger.log(
+        level,
+        f"{message} (slow)" if slow else message,
+        extra={
+            **extra,
+            "execution_time_ms": duration_ms,
+            "sample_rate": 1.0 if slow else settings.LOG_SUCCESS_SAMPLE_RATE
+        }
+    )
@@ -0,0 +1,136 @@
+# app/core/metrics/prometheus.py
+import os
+import time
+from contextlib import asynccontextmanager
+from functools import wraps
+from typing import Any, AsyncIterator, Callable, Optional
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess
+)
+from prometheus_client import REGISTRY
+from opentelemetry import trace
+from opentelemetry.trace import Status, StatusCode
+
+tracer = trace.get_tracer("app.dependencies")
+
+# Under gunicorn, set PROMETHEUS_MULTIPROC_DIR so every worker writes its
+# samples to shared files and /metrics aggregates them (see gunicorn.conf.py)
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being handled by route",
+    ["method", "route"],
+    multiprocess_mode="livesum"
+)
+DEPENDENCY_CALL_DURATION = Histogram(
+    "dependency_call_duration_seconds",
+    "Latency of calls to external dependencies",
+    ["dependency", "operation"],
+    buckets=LATENCY_BUCKETS
+)
+DEPENDENCY_ERRORS = Counter(
+    "dependency_errors_total",
+    "Failed calls to external dependencies",
+    ["dependency", "operation", "error"]
+)
+DEPENDENCY_RETRIES = Counter(
+    "dependency_retries_total",
+    "Retried calls to external dependencies",
+    ["dependency", "operation"]
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by result",
+    ["cache", "result"]
+)
+CLAUDE_TOKENS = Counter(
+    "claude_tokens_total",
+    "Claude tokens used",
+    ["model", "type"]
+)
+EVENT_LOOP_LAG = Gauge(
+    "event_loop_lag_seconds",
+    "Most recent event loop scheduling delay",
+    multiprocess_mode="livemax"
+)
+EVENT_LOOP_STALLS = Counter(
+    "event_loop_stalls_total",
+    "Event loop stalls longer than LOOP_LAG_THRESHOLD_MS"
+)
+
+@asynccontextmanager
+async def observe_dependency(dependency: str, operation: str) -> AsyncIterator[None]:
+    """Time, trace and count failures of a call to an external dependency"""
+    start_time = time.perf_counter()
+    with tracer.start_as_current_span(
+        f"{dependency}.{operation}",
+        kind=trace.SpanKind.CLIENT,
+        attributes={"peer.service": dependency, "dependency.operation": operation},
+        record_exception=False,
+        set_status_on_exception=False
+    ) as span:
+        try:
+            yield
+        except Exception as e:
+            DEPENDENCY_ERRORS.labels(dependency, operation, type(e).__name__).inc()
+            span.record_exception(e)
+            span.set_status(Status(StatusCode.ERROR, str(e)))
+            raise
+        finally:
+            DEPENDENCY_CALL_DURATION.labels(dependency, operation).observe(time.perf_counter() - start_time)
+
+def instrument(dependency: str, operation: Optional[str] = None):
+    """Decorator form of observe_dependency for async functions"""
+    def decorator(func: Callable):
+        name = operation or func.__name__
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            async with observe_dependency(dependency, name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def record_retry(dependency: str, operation: str) -> None:
+    DEPENDENCY_RETRIES.labels(dependency, operation).inc()
+
+def retry_counter(dependency: str, operation: str) -> Callable[[Any], None]:
+    """tenacity ``before_sleep`` hook that counts retries"""
+    def before_sleep(retry_state: Any) -> None:
+        record_retry(dependency, operation)
+    return before_sleep
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+def record_claude_usage(model: str, usage: Any) -> None:
+    """Count tokens from an Anthropic response's usage block"""
+    if usage is None:
+        return
+    CLAUDE_TOKENS.labels(model, "input").inc(getattr(usage, "input_tokens", 0) or 0)
+    CLAUDE_TOKENS.labels(model, "output").inc(getattr(usage, "output_tokens", 0) or 0)
+
+def render_metrics() -> bytes:
+    """Current metrics in the Prometheus text format, across all workers"""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
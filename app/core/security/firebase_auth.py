@@ -1,13 +1,25 @@
 # app/core/security/firebase_auth.py
+import asyncio
+import hashlib
+import re
+import time
+import aiohttp
 import firebase_admin
+import jwt
+from cachetools import TLRUCache
+from cryptography.x509 import load_pem_x509_certificate
 from firebase_admin import auth, credentials
-from fastapi import HTTPException, Security
-from fastapi.security import HTTPBearer
-from typing import Dict, Any
+from fastapi import HTTPException, Request, Security
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from typing import Dict, Any, Optional
 from app.core.config.settings import settings
+from app.core.logging.logging_config import logger
+from app.core.metrics.prometheus import observe_dependency, record_cache
 
 security = HTTPBearer()
 
+GOOGLE_CERTS_URL = "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+
 def initialize_firebase():
     try:
         cred = credentials.Certificate(settings.FIREBASE_CREDENTIALS_PATH)
@@ -18,16 +30,158 @@ def initialize_firebase():
 
 firebase_app = initialize_firebase()
 
-async def verify_firebase_token(credential: Security = Security(security)) -> Dict[str, Any]:
+class FirebaseCertificateStore:
+    """Google's ID token signing keys, prefetched and refreshed in the background"""
+
+    DEFAULT_MAX_AGE = 3600
+
+    def __init__(self):
+        self._keys: Dict[str, Any] = {}
+        self._max_age = self.DEFAULT_MAX_AGE
+        self._refreshed_at = 0.0
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def get(self, kid: str) -> Optional[Any]:
+        return self._keys.get(kid)
+
+    async def refresh(self, min_interval: float = 0) -> int:
+        """Fetch the current certificates; returns how long they may be cached"""
+        async with self._lock:
+            # Concurrent misses on an unknown key id share one fetch
+            if time.monotonic() - self._refreshed_at < min_interval:
+                return self._max_age
+
+            async with observe_dependency("firebase", "fetch_certificates"), aiohttp.ClientSession() as session:
+                async with session.get(GOOGLE_CERTS_URL, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                    response.raise_for_status()
+                    certificates = await response.json()
+                    cache_control = response.headers.get("Cache-Control", "")
+
+            self._keys = {
+                kid: load_pem_x509_certificate(pem.encode()).public_key()
+                for kid, pem in certificates.items()
+            }
+            match = re.search(r"max-age=(\d+)", cache_control)
+            self._max_age = int(match.group(1)) if match else self.DEFAULT_MAX_AGE
+            self._refreshed_at = time.monotonic()
+            return self._max_age
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop(), name="firebase-cert-refresh")
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                max_age = await self.refresh()
+                # Refresh well before Google rotates the keys out
+                await asyncio.sleep(max(60, max_age - 600))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Firebase certificate refresh failed: {str(e)}")
+                await asyncio.sleep(60)
+
+class FirebaseTokenVerifier:
+    """
+    Verifies Firebase ID tokens off the event loop and caches the results
+
+    Signatures are checked against prefetched Google certificates, so the hot
+    path makes no network calls. Verified claims are cached by token hash until
+    the token's ``exp``; a repeat token costs one hash and one dict lookup.
+    """
+
+    def __init__(self, project_id: Optional[str] = None, cache_size: Optional[int] = None):
+        self.project_id = project_id or settings.FIREBASE_PROJECT_ID
+        self.certificates = FirebaseCertificateStore()
+        self._cache = TLRUCache(
+            maxsize=cache_size or settings.FIREBASE_TOKEN_CACHE_SIZE,
+            ttu=lambda _key, claims, _now: claims["exp"],
+            timer=time.time
+        )
+
+    async def verify(self, token: str) -> Dict[str, Any]:
+        """Return the decoded claims of a valid token, raising otherwise"""
+        cache_key = hashlib.sha256(token.encode()).hexdigest()
+        claims = self._cache.get(cache_key)
+        record_cache("firebase_token", claims is not None)
+        if claims is not None:
+            return claims
+
+        kid = jwt.get_unverified_header(token).get("kid")
+        public_key = self.certificates.get(kid)
+        if public_key is None:
+            await self.certificates.refresh(min_interval=30)
+            public_key = self.certificates.get(kid)
+
+        if public_key is None:
+            # Unknown key id even after a refresh; let firebase-admin make the call
+            async with observe_dependency("firebase", "verify_id_token"):
+                claims = await asyncio.to_thread(auth.verify_id_token, token)
+        else:
+            claims = await asyncio.to_thread(self._decode, token, public_key)
+
+        self._cache[cache_key] = claims
+        return claims
+
+    def start(self) -> None:
+        """Prefetch certificates and keep them fresh"""
+        self.certificates.start()
+
+    async def close(self) -> None:
+        await self.certificates.close()
+
+    def _decode(self, token: str, public_key: Any) -> Dict[str, Any]:
+        """Check the token the way firebase-admin's verify_id_token does"""
+        claims = jwt.decode(
+            token,
+            public_key,
+            algorithms=["RS256"],
+            audience=self.project_id,
+            issuer=f"https://securetoken.google.com/{self.project_id}",
+            options={"require": ["exp", "iat", "sub", "auth_time"]}
+        )
+        subject = claims["sub"]
+        if not subject or len(subject) > 128:
+            raise jwt.InvalidTokenError("Invalid subject")
+        if claims["auth_time"] > time.time():
+            raise jwt.InvalidTokenError("Token auth_time is in the future")
+        claims["uid"] = subject
+        return claims
+
+token_verifier = FirebaseTokenVerifier()
+
+async def verify_firebase_token(
+    request: Request,
+    credential: HTTPAuthorizationCredentials = Security(security)
+) -> Dict[str, Any]:
     """
     Verify Firebase JWT token from request Authorization header
     Returns decoded token if valid, raises HTTPException if invalid
     """
+    # Verified once per request; later dependencies and decorators reuse it
+    token_data = getattr(request.state, "token_data", None)
+    if token_data is not None:
+        return token_data
+
     try:
-        decoded_token = auth.verify_id_token(credential.credentials)
-        return decoded_token
+        token_data = await token_verifier.verify(credential.credentials)
     except Exception as e:
         raise HTTPException(
             status_code=401,
             detail=f"Invalid authentication credentials: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+    request.state.token_data = token_data
+    return token_data
@@ -0,0 +1,127 @@
+# app/core/security/session.py
+import asyncio
+import time
+import uuid
+from firebase_admin import auth
+from jose import jwt, JWTError
+from fastapi import HTTPException, Request, Security
+from fastapi.security import HTTPAuthorizationCredentials
+from typing import Dict, Any, Optional
+from app.core.config.settings import settings
+from app.core.metrics.prometheus import observe_dependency
+from app.core.security.firebase_auth import security, verify_firebase_token
+
+ACCESS_TOKEN = "access"
+REFRESH_TOKEN = "refresh"
+
+# Claims copied into session tokens. ``auth_time`` is Firebase's sign-in time,
+# kept for revocation checks; ``sid_iat`` is when this session was created.
+SESSION_CLAIMS = ("uid", "email", "roles", "admin", "auth_time")
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=401,
+        detail=f"Invalid authentication credentials: {detail}",
+        headers={"WWW-Authenticate": "Bearer"}
+    )
+
+def _session_expiry(claims: Dict[str, Any]) -> int:
+    """Absolute end of the session, counted from the token exchange"""
+    return int(claims["sid_iat"]) + settings.SESSION_MAX_AGE_DAYS * 86400
+
+def _encode(claims: Dict[str, Any], token_type: str, now: int, expires_at: int) -> str:
+    payload = {
+        **claims,
+        "sub": claims["uid"],
+        "typ": token_type,
+        "iat": now,
+        "exp": expires_at,
+        "jti": uuid.uuid4().hex
+    }
+    return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+
+def create_session_tokens(token_data: Dict[str, Any], session_started_at: Optional[int] = None) -> Dict[str, Any]:
+    """Issue an access/refresh token pair for verified user claims
+
+    A token exchange starts a new session now; refreshes pass the original
+    ``session_started_at`` so they cannot extend the session beyond
+    SESSION_MAX_AGE_DAYS.
+    """
+    now = int(time.time())
+    claims = {key: token_data[key] for key in SESSION_CLAIMS if key in token_data}
+    claims.setdefault("auth_time", now)
+    claims["sid_iat"] = session_started_at or now
+    session_end = _session_expiry(claims)
+    access_expiry = min(now + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60, session_end)
+    refresh_expiry = min(now + settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400, session_end)
+    return {
+        "access_token": _encode(claims, ACCESS_TOKEN, now, access_expiry),
+        "refresh_token": _encode(claims, REFRESH_TOKEN, now, refresh_expiry),
+        "token_type": "bearer",
+        "expires_in": access_expiry - now
+    }
+
+def decode_session_token(token: str, token_type: str = ACCESS_TOKEN) -> Dict[str, Any]:
+    """Decode a session token of the given type, raising 401 if invalid"""
+    try:
+        claims = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+    except JWTError as e:
+        raise _unauthorized(str(e))
+    if claims.get("typ") != token_type or not claims.get("uid"):
+        raise _unauthorized("wrong token type")
+    if "auth_time" not in claims or "sid_iat" not in claims or _session_expiry(claims) <= time.time():
+        raise _unauthorized("session expired")
+    return claims
+
+async def refresh_session_tokens(refresh_token: str) -> Dict[str, Any]:
+    """
+    Rotate a session from a refresh token, re-reading the user from Firebase
+    Disabled or revoked users are rejected and claims reflect the current
+    custom claims rather than those of the original sign-in
+    """
+    claims = decode_session_token(refresh_token, REFRESH_TOKEN)
+    try:
+        async with observe_dependency("firebase", "get_user"):
+            user = await asyncio.to_thread(auth.get_user, claims["uid"])
+    except auth.UserNotFoundError:
+        raise _unauthorized("user not found")
+
+    if user.disabled:
+        raise _unauthorized("user disabled")
+    # Same check firebase-admin applies with check_revoked=True
+    if user.tokens_valid_after_timestamp and claims["auth_time"] * 1000 < user.tokens_valid_after_timestamp:
+        raise _unauthorized("session revoked")
+
+    return create_session_tokens(
+        {
+            **(user.custom_claims or {}),
+            "uid": user.uid,
+            "email": user.email,
+            "auth_time": claims["auth_time"]
+        },
+        session_started_at=claims["sid_iat"]
+    )
+
+async def verify_token(
+    request: Request,
+    credential: HTTPAuthorizationCredentials = Security(security)
+) -> Dict[str, Any]:
+    """
+    Authenticate with either a session access token or a Firebase ID token
+    Session tokens are checked locally with HMAC; anything else goes to Firebase
+    """
+    token_data = getattr(request.state, "token_data", None)
+    if token_data is not None:
+        return token_data
+
+    try:
+        algorithm = jwt.get_unverified_header(credential.credentials).get("alg")
+    except JWTError:
+        algorithm = None
+
+    if algorithm != settings.JWT_ALGORITHM:
+        return await verify_firebase_token(request, credential)
+
+    token_data = decode_session_token(credential.credentials)
+    request.state.token_data = token_data
+    return token_data
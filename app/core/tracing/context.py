@@ -0,0 +1,14 @@
+# app/core/tracing/context.py
+from contextvars import ContextVar
+from typing import Optional, Tuple
+from opentelemetry import trace
+
+# Set per request by request_context_middleware, read by RequestIdFilter
+request_id_var: ContextVar[str] = ContextVar("request_id", default="no_request_id")
+
+def current_trace_ids() -> Tuple[Optional[str], Optional[str]]:
+    """(trace_id, span_id) of the active span as hex, or (None, None)"""
+    span_context = trace.get_current_span().get_span_context()
+    if not span_context.is_valid:
+        return None, None
+    return format(span_context.trace_id, "032x"), format(span_context.span_id, "016x")
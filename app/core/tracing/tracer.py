@@ -0,0 +1,39 @@
+# app/core/tracing/tracer.py
+from typing import Optional
+from fastapi import FastAPI
+from opentelemetry import trace
+from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from app.core.config.settings import get_settings
+
+settings = get_settings()
+
+tracer = trace.get_tracer("app")
+
+def setup_tracing(app: FastAPI, exporter: Optional[SpanExporter] = None) -> TracerProvider:
+    """Install the tracer provider and instrument the FastAPI app
+
+    Spans are exported over OTLP when OTEL_EXPORTER_OTLP_ENDPOINT is set;
+    tests pass an in-memory exporter instead.
+    """
+    provider = TracerProvider(
+        resource=Resource.create({
+            "service.name": settings.APP_NAME,
+            "deployment.environment": settings.ENVIRONMENT
+        }),
+        # Follow the caller's sampling decision, otherwise sample a fraction
+        sampler=ParentBased(TraceIdRatioBased(settings.OTEL_SAMPLE_RATIO))
+    )
+    if exporter is None and settings.OTEL_EXPORTER_OTLP_ENDPOINT:
+        exporter = OTLPSpanExporter(endpoint=settings.OTEL_EXPORTER_OTLP_ENDPOINT)
+    if exporter is not None:
+        provider.add_span_processor(BatchSpanProcessor(exporter))
+
+    trace.set_tracer_provider(provider)
+    # Matched with re.search against the full URL, so anchor to the root scrape route
+    FastAPIInstrumentor.instrument_app(app, tracer_provider=provider, excluded_urls="://[^/]+/metrics$")
+    return provider
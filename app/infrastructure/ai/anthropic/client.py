@@ -2,6 +2,7 @@ from typing import Any, Dict, Optional
 import anthropic
 from app.core.config.settings import get_settings
 from app.core.logging.logging_config import logger
+from app.core.metrics.prometheus import observe_dependency, record_claude_usage
 from app.shared.exceptions.base import AppException
 
 settings = get_settings()
@@ -23,15 +24,17 @@ class ClaudeClient:
     ) -> str:
         """Generate a response from Claude"""
         try:
-            message = await self.client.messages.create(
-                model=self.model,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                system=system_prompt,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
+            async with observe_dependency("claude", "messages.create"):
+                message = await self.client.messages.create(
+                    model=self.model,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    system=system_prompt,
+                    messages=[
+                        {"role": "user", "content": prompt}
+                    ]
+                )
+            record_claude_usage(self.model, getattr(message, "usage", None))
             return message.content
 
         except Exception as e:
@@ -71,11 +74,13 @@ class ClaudeClient:
                 
             formatted_messages.extend(messages)
             
-            message = await self.client.messages.create(
-                model=self.model,
-                messages=formatted_messages,
-                system=system_prompt
-            )
+            async with observe_dependency("claude", "messages.create"):
+                message = await self.client.messages.create(
+                    model=self.model,
+                    messages=formatted_messages,
+                    system=system_prompt
+                )
+            record_claude_usage(self.model, getattr(message, "usage", None))
             return message.content
 
         except Exception as e:
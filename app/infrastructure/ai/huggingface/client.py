@@ -1,11 +1,36 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+import asyncio
+import json
+import time
 import aiohttp
 from app.core.config.settings import get_settings
 from app.core.logging.logging_config import logger
+from app.core.metrics.prometheus import instrument, record_retry
+from app.shared.exceptions.base import ServiceUnavailableError
 
 settings = get_settings()
 
+# Tiny 8x8 white PNG used to ping image models during warm-up
+WARMUP_IMAGE = bytes.fromhex(
+    "89504e470d0a1a0a0000000d49484452000000080000000808020000004b6d29dc"
+    "0000000f4944415478da63f88f03300c2d0900ba1ebf4189e8b6bb0000000049454e44ae426082"
+)
+
+class ModelLoadingError(ServiceUnavailableError):
+    """Raised when a model is still loading and the request deadline does not allow waiting"""
+
+    def __init__(self, model_id: str, estimated_time: float):
+        super().__init__(
+            f"Model {model_id} is loading, retry in {int(estimated_time) + 1} seconds",
+            extra={"retry_after": int(estimated_time) + 1}
+        )
+        self.model_id = model_id
+        self.estimated_time = estimated_time
+
 class HuggingFaceClient:
+    # Pause between polls when the API does not report an estimated load time
+    DEFAULT_LOADING_WAIT = 5.0
+
     def __init__(self):
         self.api_key = settings.HUGGINGFACE_API_KEY
         self.base_url = "https://api-inference.huggingface.co/models"
@@ -14,28 +39,77 @@ class HuggingFaceClient:
             "Authorization": f"Bearer {self.api_key}"
         }
 
-    async def query_model(self, model_id: str, image_bytes: bytes) -> Dict[str, Any]:
-        """Query Hugging Face model API with raw image data"""
+    @instrument("huggingface", "inference")
+    async def query_model(
+        self,
+        model_id: str,
+        image_bytes: bytes,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Query Hugging Face model API with raw image data
+
+        Cold models answer 503 with an ``estimated_time``; the request is retried
+        after that estimate as long as it fits within ``timeout`` seconds.
+        """
         url = f"{self.base_url}/{model_id}"
+        deadline = time.monotonic() + (timeout or settings.REQUEST_TIMEOUT)
         try:
             async with aiohttp.ClientSession() as session:
-                # Send image bytes directly without any JSON encoding
-                async with session.post(
-                    url,
-                    headers=self.headers,
-                    data=image_bytes,
-                    timeout=30
-                ) as response:
-                    if response.status != 200:
+                while True:
+                    remaining = deadline - time.monotonic()
+                    # Send image bytes directly without any JSON encoding
+                    async with session.post(
+                        url,
+                        headers=self.headers,
+                        data=image_bytes,
+                        timeout=aiohttp.ClientTimeout(total=max(remaining, 1))
+                    ) as response:
+                        if response.status == 200:
+                            return await response.json()
+
                         error_text = await response.text()
-                        logger.error(f"HuggingFace API error: {error_text}")
-                        raise Exception(f"API request failed: {error_text}")
-                    
-                    return await response.json()
-                    
+                        estimated_time = self._loading_estimate(response.status, error_text)
+                        if estimated_time is None:
+                            logger.error(f"HuggingFace API error: {error_text}")
+                            raise Exception(f"API request failed: {error_text}")
+
+                    remaining = deadline - time.monotonic()
+                    if estimated_time >= remaining:
+                        raise ModelLoadingError(model_id, estimated_time)
+
+                    logger.info(f"Model {model_id} is loading, waiting {estimated_time:.1f}s")
+                    record_retry("huggingface", "inference")
+                    await asyncio.sleep(estimated_time)
+
+        except ModelLoadingError:
+            logger.warning(f"Model {model_id} will not finish loading within the request deadline")
+            raise
+        except asyncio.TimeoutError:
+            logger.error(f"HuggingFace request to {model_id} timed out")
+            raise Exception(f"Request to {model_id} timed out")
         except aiohttp.ClientError as e:
             logger.error(f"Network error: {str(e)}")
             raise Exception(f"Network error: {str(e)}")
         except Exception as e:
             logger.error(f"HuggingFace API error: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+
+    async def warm_up(self, model_id: str) -> bool:
+        """Ping a model so the Inference API loads it; returns True if it is ready"""
+        try:
+            await self.query_model(model_id, WARMUP_IMAGE)
+            return True
+        except ModelLoadingError:
+            return False
+
+    def _loading_estimate(self, status: int, error_text: str) -> Optional[float]:
+        """Return the estimated load time if the response means the model is loading"""
+        if status != 503:
+            return None
+        try:
+            payload = json.loads(error_text)
+        except ValueError:
+            return None
+        if not isinstance(payload, dict) or "loading" not in str(payload.get("error", "")).lower():
+            return None
+        return float(payload.get("estimated_time") or self.DEFAULT_LOADING_WAIT)
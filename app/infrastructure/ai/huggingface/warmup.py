@@ -0,0 +1,54 @@
+import asyncio
+from typing import List, Optional
+from app.core.config.settings import get_settings
+from app.core.logging.logging_config import logger
+from app.infrastructure.ai.huggingface.client import HuggingFaceClient
+
+settings = get_settings()
+
+class ModelWarmer:
+    """Background task that periodically pings Inference API models to keep them loaded"""
+
+    def __init__(
+        self,
+        client: Optional[HuggingFaceClient] = None,
+        model_ids: Optional[List[str]] = None,
+        interval: Optional[int] = None
+    ):
+        self.client = client or HuggingFaceClient()
+        self.model_ids = model_ids if model_ids is not None else settings.HUGGINGFACE_WARMUP_MODELS
+        self.interval = interval or settings.HUGGINGFACE_WARMUP_INTERVAL
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the warm-up loop on the running event loop"""
+        if self._task is None and self.model_ids:
+            self._task = asyncio.create_task(self._run(), name="hf-model-warmup")
+
+    async def stop(self) -> None:
+        """Cancel the warm-up loop and wait for it to finish"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def warm_up_all(self) -> None:
+        """Ping every configured model once"""
+        results = await asyncio.gather(
+            *(self.client.warm_up(model_id) for model_id in self.model_ids),
+            return_exceptions=True
+        )
+        for model_id, result in zip(self.model_ids, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Warm-up of {model_id} failed: {str(result)}")
+            elif not result:
+                logger.info(f"Model {model_id} is loading after warm-up ping")
+
+    async def _run(self) -> None:
+        while True:
+            await self.warm_up_all()
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,145 @@
+import asyncio
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, List, Optional, Union
+from app.core.config.settings import get_settings
+from app.core.logging.logging_config import logger
+from app.shared.exceptions.base import AppException
+from app.shared.utils.helpers.batching import MicroBatcher
+
+settings = get_settings()
+
+class OnnxCaptioningModel:
+    """
+    BLIP-style captioning model running on onnxruntime
+
+    ``model_dir`` holds the processor/tokenizer files saved with ``save_pretrained``
+    plus two ONNX graphs:
+      - ``vision_encoder.onnx``: ``pixel_values`` -> image embeddings
+      - ``text_decoder.onnx``: ``input_ids``, ``attention_mask``,
+        ``encoder_hidden_states`` -> logits
+    Captions are produced with greedy decoding.
+    """
+
+    ENCODER_FILE = "vision_encoder.onnx"
+    DECODER_FILE = "text_decoder.onnx"
+
+    def __init__(self, model_dir: str, max_length: int = 30, intra_op_threads: int = 0):
+        import onnxruntime as ort
+        from transformers import BlipProcessor
+
+        model_path = Path(model_dir)
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = intra_op_threads
+        providers = ["CPUExecutionProvider"]
+
+        self.processor = BlipProcessor.from_pretrained(model_dir)
+        self.encoder = ort.InferenceSession(str(model_path / self.ENCODER_FILE), options, providers=providers)
+        self.decoder = ort.InferenceSession(str(model_path / self.DECODER_FILE), options, providers=providers)
+        self.max_length = max_length
+
+        tokenizer = self.processor.tokenizer
+        self.bos_token_id = tokenizer.bos_token_id
+        self.eos_token_id = tokenizer.sep_token_id
+        self.pad_token_id = tokenizer.pad_token_id
+
+    def generate(self, images: List[Any]) -> List[str]:
+        """Caption a batch of decoded images in a single forward pass per token"""
+        import numpy as np
+
+        pixel_values = self.processor(images=images, return_tensors="np")["pixel_values"]
+        image_embeds = self.encoder.run(None, {"pixel_values": pixel_values.astype(np.float32)})[0]
+
+        batch_size = len(images)
+        input_ids = np.full((batch_size, 1), self.bos_token_id, dtype=np.int64)
+        finished = np.zeros(batch_size, dtype=bool)
+
+        for _ in range(self.max_length):
+            logits = self.decoder.run(None, {
+                "input_ids": input_ids,
+                "attention_mask": np.ones_like(input_ids),
+                "encoder_hidden_states": image_embeds
+            })[0]
+            next_tokens = np.where(finished, self.pad_token_id, logits[:, -1, :].argmax(-1))
+            input_ids = np.concatenate([input_ids, next_tokens[:, None]], axis=1)
+            finished |= next_tokens == self.eos_token_id
+            if finished.all():
+                break
+
+        return [caption.strip() for caption in self.processor.batch_decode(input_ids, skip_special_tokens=True)]
+
+# Loaded once per worker process by the pool initializer
+_worker_model: Optional[OnnxCaptioningModel] = None
+
+def _init_worker(model_dir: str, max_length: int, intra_op_threads: int) -> None:
+    global _worker_model
+    _worker_model = OnnxCaptioningModel(model_dir, max_length, intra_op_threads)
+
+def _caption_batch(images: List[bytes]) -> List[Union[str, Exception]]:
+    """Worker entry point; undecodable images fail individually instead of failing the batch"""
+    from PIL import Image
+
+    results: List[Union[str, Exception]] = [None] * len(images)
+    decoded, indices = [], []
+    for i, image_bytes in enumerate(images):
+        try:
+            decoded.append(Image.open(io.BytesIO(image_bytes)).convert("RGB"))
+            indices.append(i)
+        except Exception as e:
+            results[i] = ValueError(f"Invalid image: {str(e)}")
+
+    if decoded:
+        for i, caption in zip(indices, _worker_model.generate(decoded)):
+            results[i] = caption
+    return results
+
+class OnnxCaptioningClient:
+    """Runs a local ONNX captioning model in a process pool with dynamic micro-batching"""
+
+    def __init__(
+        self,
+        model_dir: Optional[str] = None,
+        num_workers: Optional[int] = None,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[int] = None
+    ):
+        self.model_dir = model_dir or settings.ONNX_CAPTIONING_MODEL_DIR
+        self.num_workers = num_workers or settings.ONNX_NUM_WORKERS
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._batcher = MicroBatcher(
+            self._run_batch,
+            max_batch_size=max_batch_size or settings.ONNX_MAX_BATCH_SIZE,
+            max_wait_ms=max_wait_ms if max_wait_ms is not None else settings.ONNX_MAX_BATCH_WAIT_MS,
+            max_concurrency=self.num_workers
+        )
+
+    async def caption(self, image_bytes: bytes) -> str:
+        """Caption a single image; concurrent calls are batched together"""
+        return await self._batcher.submit(image_bytes)
+
+    async def close(self) -> None:
+        """Stop batching and shut the worker processes down"""
+        await self._batcher.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            if not Path(self.model_dir).exists():
+                raise AppException(f"ONNX captioning model not found: {self.model_dir}")
+            # Spawn instead of fork so workers do not inherit the event loop or client sockets
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.num_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.model_dir, settings.ONNX_MAX_CAPTION_LENGTH, settings.ONNX_INTRA_OP_THREADS)
+            )
+        return self._executor
+
+    async def _run_batch(self, images: List[bytes]) -> List[Union[str, Exception]]:
+        loop = asyncio.get_running_loop()
+        logger.debug(f"Running ONNX captioning batch of {len(images)}")
+        return await loop.run_in_executor(self._get_executor(), _caption_batch, images)
@@ -3,6 +3,7 @@ import boto3
 from botocore.exceptions import ClientError
 from app.core.config.settings import get_settings
 from app.core.logging.logging_config import logger
+from app.core.metrics.prometheus import observe_dependency
 from app.shared.exceptions.base import AppException
 
 settings = get_settings()
@@ -44,7 +45,8 @@ class AmazonClient:
             if category:
                 params['SearchIndex'] = category
 
-            response = await self.client.search_items(**params)
+            async with observe_dependency("paapi", "search_items"):
+                response = await self.client.search_items(**params)
             
             if 'ItemsResult' not in response:
                 return []
@@ -60,20 +62,21 @@ class AmazonClient:
     async def get_item_details(self, asin: str) -> Dict[str, Any]:
         """Get detailed information about a specific item"""
         try:
-            response = await self.client.get_items(
-                ItemIds=[asin],
-                Marketplace=self.marketplace,
-                PartnerTag=self.partner_tag,
-                PartnerType='Associates',
-                Resources=[
-                    'ItemInfo.Title',
-                    'ItemInfo.Features',
-                    'ItemInfo.ProductInfo',
-                    'Offers.Listings.Price',
-                    'Images.Primary.Large',
-                    'Images.Variants.Large'
-                ]
-            )
+            async with observe_dependency("paapi", "get_items"):
+                response = await self.client.get_items(
+                    ItemIds=[asin],
+                    Marketplace=self.marketplace,
+                    PartnerTag=self.partner_tag,
+                    PartnerType='Associates',
+                    Resources=[
+                        'ItemInfo.Title',
+                        'ItemInfo.Features',
+                        'ItemInfo.ProductInfo',
+                        'Offers.Listings.Price',
+                        'Images.Primary.Large',
+                        'Images.Variants.Large'
+                    ]
+                )
             
             if 'ItemsResult' not in response:
                 raise AppException(f"Item {asin} not found")
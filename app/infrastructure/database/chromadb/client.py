@@ -7,12 +7,15 @@
 # def get_chroma_collection(collection_name: str):
 #     return chroma_client.get_collection(collection_name)
 
+import time
 from typing import Any, Dict, List, Optional
 import chromadb
 from chromadb.config import Settings
 from chromadb.api import Collection
 from app.core.config.settings import get_settings
 from app.core.logging.logging_config import logger
+from app.core.logging.policy import log_success
+from app.core.metrics.prometheus import observe_dependency, retry_counter
 from app.shared.exceptions.base import AppException
 from tenacity import retry, stop_after_attempt, wait_exponential
 
@@ -33,8 +36,8 @@ class ChromaDBClient:
     
     def __init__(self):
         if not self._initialized:
-            self._initialize_client()
             self.logger = logger
+            self._initialize_client()
             self._initialized = True
             
     def _initialize_client(self):
@@ -52,7 +55,8 @@ class ChromaDBClient:
 
     @retry(
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10)
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        before_sleep=retry_counter("chromadb", "get_or_create_collection")
     )
     async def get_or_create_collection(
         self,
@@ -61,11 +65,12 @@ class ChromaDBClient:
     ) -> Collection:
         """Get or create a collection with retry mechanism"""
         try:
-            collection = self.client.get_or_create_collection(
-                name=name,
-                metadata=metadata or {}
-            )
-            self.logger.info(f"Successfully accessed collection: {name}")
+            async with observe_dependency("chromadb", "get_or_create_collection"):
+                collection = self.client.get_or_create_collection(
+                    name=name,
+                    metadata=metadata or {}
+                )
+            self.logger.debug(f"Accessed collection: {name}")
             return collection
         except Exception as e:
             self.logger.error(f"ChromaDB error: {str(e)}", exc_info=True)
@@ -73,7 +78,8 @@ class ChromaDBClient:
 
     @retry(
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10)
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        before_sleep=retry_counter("chromadb", "add")
     )
     async def add_documents(
         self,
@@ -83,6 +89,7 @@ class ChromaDBClient:
         ids: Optional[List[str]] = None
     ) -> None:
         """Add documents to a collection with retry mechanism"""
+        start_time = time.perf_counter()
         try:
             collection = await self.get_or_create_collection(collection_name)
             
@@ -96,13 +103,18 @@ class ChromaDBClient:
             if ids and len(ids) != len(documents):
                 raise AppException("Number of ids must match number of documents")
             
-            collection.add(
-                documents=documents,
-                metadatas=metadatas,
-                ids=ids or [str(i) for i in range(len(documents))]
-            )
+            async with observe_dependency("chromadb", "add"):
+                collection.add(
+                    documents=documents,
+                    metadatas=metadatas,
+                    ids=ids or [str(i) for i in range(len(documents))]
+                )
             
-            self.logger.info(f"Successfully added {len(documents)} documents to collection: {collection_name}")
+            log_success(
+                self.logger,
+                f"Added {len(documents)} documents to collection: {collection_name}",
+                (time.perf_counter() - start_time) * 1000
+            )
             
         except Exception as e:
             self.logger.error(f"ChromaDB error: {str(e)}", exc_info=True)
@@ -110,7 +122,8 @@ class ChromaDBClient:
 
     @retry(
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10)
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        before_sleep=retry_counter("chromadb", "query")
     )
     async def query(
         self,
@@ -120,16 +133,22 @@ class ChromaDBClient:
         where: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """Query documents from a collection with retry mechanism"""
+        start_time = time.perf_counter()
         try:
             collection = await self.get_or_create_collection(collection_name)
             
-            results = collection.query(
-                query_texts=query_texts,
-                n_results=n_results,
-                where=where
-            )
+            async with observe_dependency("chromadb", "query"):
+                results = collection.query(
+                    query_texts=query_texts,
+                    n_results=n_results,
+                    where=where
+                )
             
-            self.logger.info(f"Successfully queried collection: {collection_name}")
+            log_success(
+                self.logger,
+                f"Queried collection: {collection_name}",
+                (time.perf_counter() - start_time) * 1000
+            )
             
             return {
                 'documents': results['documents'],
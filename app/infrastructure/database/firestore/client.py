@@ -5,4 +5,6 @@ import os
 if not os.getenv("GOOGLE_APPLICATION_CREDENTIALS"):
     raise EnvironmentError("GOOGLE_APPLICATION_CREDENTIALS environment variable is not set")
 
-db = firestore.Client()
\ No newline at end of file
+db = firestore.Client()
+# Non-blocking client for request handlers and repositories
+async_db = firestore.AsyncClient()
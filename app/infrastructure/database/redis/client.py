@@ -1,9 +1,107 @@
-import redis
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+import redis.asyncio as redis
+from app.core.config.settings import get_settings
+from app.core.logging.logging_config import logger
+from app.core.metrics.prometheus import instrument
 
-redis_client = redis.StrictRedis.from_url("redis://localhost:6379/0")
+settings = get_settings()
 
-def cache_data(key, value, expiration=3600):
-    redis_client.setex(key, expiration, value)
+class RedisClient:
+    """
+    Async Redis client backed by a bounded connection pool
 
-def get_cached_data(key):
-    return redis_client.get(key)
\ No newline at end of file
+    The pool is created lazily from settings and shared by every caller in the
+    process. When all REDIS_MAX_CONNECTIONS connections are busy, callers wait
+    up to REDIS_TIMEOUT seconds for one to be released instead of opening more.
+    """
+
+    def __init__(self):
+        self._pool: Optional[redis.BlockingConnectionPool] = None
+        self._client: Optional[redis.Redis] = None
+
+    @property
+    def client(self) -> redis.Redis:
+        if self._client is None:
+            url = settings.REDIS_URL
+            if settings.REDIS_SSL and url.startswith("redis://"):
+                url = "rediss://" + url[len("redis://"):]
+            self._pool = redis.BlockingConnectionPool.from_url(
+                url,
+                password=settings.REDIS_PASSWORD,
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+                timeout=settings.REDIS_TIMEOUT,
+                socket_timeout=settings.REDIS_TIMEOUT,
+                socket_connect_timeout=settings.REDIS_TIMEOUT,
+                health_check_interval=30
+            )
+            self._client = redis.Redis(connection_pool=self._pool)
+        return self._client
+
+    async def connect(self) -> None:
+        """Create the pool and verify the server is reachable"""
+        try:
+            await self.client.ping()
+        except redis.RedisError as e:
+            logger.error(f"Redis connection failed: {str(e)}")
+
+    async def close(self) -> None:
+        """Close the client and every pooled connection"""
+        if self._client is not None:
+            await self._client.aclose()
+            await self._pool.disconnect()
+            self._client = None
+            self._pool = None
+
+    def pipeline(self, transaction: bool = False) -> redis.client.Pipeline:
+        """Start a pipeline; commands are sent in one round-trip on execute()"""
+        return self.client.pipeline(transaction=transaction)
+
+    @instrument("redis")
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(key)
+
+    @instrument("redis")
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        await self.client.set(key, value, ex=ttl)
+
+    @instrument("redis")
+    async def delete(self, *keys: str) -> int:
+        return await self.client.delete(*keys) if keys else 0
+
+    @instrument("redis")
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        """Fetch several keys in a single MGET"""
+        return await self.client.mget(keys) if keys else []
+
+    @instrument("redis")
+    async def set_many(self, mapping: Mapping[str, Any], ttl: Optional[int] = None) -> None:
+        """Set several keys with a shared TTL in one pipelined round-trip"""
+        if not mapping:
+            return
+        async with self.pipeline() as pipe:
+            for key, value in mapping.items():
+                pipe.set(key, value, ex=ttl)
+            await pipe.execute()
+
+    @instrument("redis")
+    async def incr_many(self, keys: Iterable[str], ttl: Optional[int] = None) -> Dict[str, int]:
+        """Increment several counters, refreshing their TTL, in one pipelined round-trip"""
+        keys = list(keys)
+        if not keys:
+            return {}
+        async with self.pipeline() as pipe:
+            for key in keys:
+                pipe.incr(key)
+                if ttl:
+                    pipe.expire(key, ttl)
+            results = await pipe.execute()
+        step = 2 if ttl else 1
+        return dict(zip(keys, results[::step]))
+
+redis_client = RedisClient()
+
+async def cache_data(key, value, expiration=3600):
+    await redis_client.set(key, value, ttl=expiration)
+
+async def get_cached_data(key):
+    return await redis_client.get(key)
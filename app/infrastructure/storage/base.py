@@ -0,0 +1,44 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional
+
+def sharded_key(content_hash: str, extension: str = "") -> str:
+    """Build a content-addressed key spread over 65,536 two-level shard prefixes"""
+    return f"{content_hash[:2]}/{content_hash[2:4]}/{content_hash}{extension}"
+
+class StorageBackend(ABC):
+    """Object storage for uploaded files, addressed by key"""
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        """Check whether an object is stored under key"""
+        pass
+
+    @abstractmethod
+    async def save_file(self, source: Path, key: str, content_type: Optional[str] = None) -> str:
+        """
+        Store a local file under key and return its location
+
+        ``source`` is consumed: it is moved or uploaded and may no longer exist
+        afterwards. Saving an existing key keeps the stored object, which makes
+        writes of content-addressed keys idempotent.
+        """
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Delete the object stored under key, if any"""
+        pass
+
+    @abstractmethod
+    def locate(self, key: str) -> str:
+        """Return the path or URI of the object stored under key"""
+        pass
+
+    def start(self) -> None:
+        """Start background maintenance such as eviction"""
+        pass
+
+    async def close(self) -> None:
+        """Stop background maintenance and release resources"""
+        pass
@@ -0,0 +1,61 @@
+import asyncio
+from pathlib import Path
+from typing import Optional
+from google.api_core.exceptions import NotFound, PreconditionFailed
+from google.cloud import storage
+from app.core.config.settings import get_settings
+from app.infrastructure.storage.base import StorageBackend
+
+settings = get_settings()
+
+class GCSStorageBackend(StorageBackend):
+    """
+    Stores objects in a Google Cloud Storage bucket below ``prefix``
+
+    Uploads use resumable, chunked transfers streamed from the source file.
+    Expiry is left to the bucket's lifecycle rules rather than done in-process.
+    """
+
+    def __init__(self, bucket_name: Optional[str] = None, prefix: str = ""):
+        self.bucket_name = bucket_name or settings.GCS_BUCKET_NAME
+        self.prefix = prefix.strip("/")
+        self._bucket: Optional[storage.Bucket] = None
+
+    @property
+    def bucket(self) -> storage.Bucket:
+        if self._bucket is None:
+            self._bucket = storage.Client().bucket(self.bucket_name)
+        return self._bucket
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(self._blob(key).exists)
+
+    async def save_file(self, source: Path, key: str, content_type: Optional[str] = None) -> str:
+        await asyncio.to_thread(self._upload, Path(source), key, content_type)
+        return self.locate(key)
+
+    async def delete(self, key: str) -> None:
+        try:
+            await asyncio.to_thread(self._blob(key).delete)
+        except NotFound:
+            pass
+
+    def locate(self, key: str) -> str:
+        return f"gs://{self.bucket_name}/{self._name(key)}"
+
+    def _name(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def _blob(self, key: str) -> storage.Blob:
+        return self.bucket.blob(self._name(key))
+
+    def _upload(self, source: Path, key: str, content_type: Optional[str]) -> None:
+        blob = self._blob(key)
+        blob.chunk_size = settings.GCS_UPLOAD_CHUNK_SIZE
+        try:
+            # Only create, never overwrite: content-addressed objects are immutable
+            blob.upload_from_filename(str(source), content_type=content_type, if_generation_match=0)
+        except PreconditionFailed:
+            pass
+        finally:
+            source.unlink(missing_ok=True)
@@ -0,0 +1,135 @@
+import asyncio
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+from app.core.config.settings import get_settings
+from app.core.logging.logging_config import logger
+from app.infrastructure.storage.base import StorageBackend
+
+settings = get_settings()
+
+class LocalStorageBackend(StorageBackend):
+    """
+    Stores objects on the local filesystem below ``root``
+
+    Keys map directly to relative paths, so sharded keys keep every directory
+    small. An object's mtime records when it was last written or reused, and a
+    background loop evicts objects older than ``ttl`` seconds, then the least
+    recently used ones until the total size fits within ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[int] = None,
+        eviction_interval: Optional[int] = None
+    ):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes if max_bytes is not None else settings.STORAGE_MAX_BYTES
+        self.ttl = ttl if ttl is not None else settings.STORAGE_TTL_SECONDS
+        self.eviction_interval = eviction_interval or settings.STORAGE_EVICTION_INTERVAL
+        self._eviction_task: Optional[asyncio.Task] = None
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(self._path(key).exists)
+
+    async def save_file(self, source: Path, key: str, content_type: Optional[str] = None) -> str:
+        await asyncio.to_thread(self._save_file, Path(source), self._path(key))
+        return self.locate(key)
+
+    async def delete(self, key: str) -> None:
+        try:
+            await asyncio.to_thread(os.remove, self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def locate(self, key: str) -> str:
+        return str(self._path(key))
+
+    def start(self) -> None:
+        if self._eviction_task is None and (self.max_bytes or self.ttl):
+            self._eviction_task = asyncio.create_task(self._eviction_loop(), name="local-storage-eviction")
+
+    async def close(self) -> None:
+        if self._eviction_task is None:
+            return
+        self._eviction_task.cancel()
+        try:
+            await self._eviction_task
+        except asyncio.CancelledError:
+            pass
+        self._eviction_task = None
+
+    async def evict(self) -> int:
+        """Run one eviction pass and return the number of removed objects"""
+        return await asyncio.to_thread(self._evict)
+
+    def _path(self, key: str) -> Path:
+        if key.startswith("/") or ".." in Path(key).parts:
+            raise ValueError(f"Invalid storage key: {key}")
+        return self.root / key
+
+    def _save_file(self, source: Path, destination: Path) -> None:
+        if destination.exists():
+            # Same content already stored; mark it as recently used
+            os.utime(destination)
+            source.unlink(missing_ok=True)
+            return
+
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            # Atomic on the same filesystem, so readers never see a partial file
+            os.replace(source, destination)
+        except OSError:
+            # Different filesystem: copy next to the destination, then rename
+            partial = destination.with_name(f".{destination.name}.part")
+            shutil.copyfile(source, partial)
+            os.replace(partial, destination)
+            source.unlink(missing_ok=True)
+
+    def _scan(self) -> List[Tuple[float, int, str]]:
+        entries = []
+        stack = [str(self.root)]
+        while stack:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False) and not entry.name.startswith("."):
+                        stat = entry.stat(follow_symlinks=False)
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _evict(self) -> int:
+        entries = sorted(self._scan())
+        total = sum(size for _, size, _ in entries)
+        expires_before = time.time() - self.ttl if self.ttl else None
+        removed = 0
+
+        for mtime, size, path in entries:
+            expired = expires_before is not None and mtime < expires_before
+            over_quota = self.max_bytes and total > self.max_bytes
+            if not expired and not over_quota:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                removed += 1
+            except FileNotFoundError:
+                pass
+
+        if removed:
+            logger.info(f"Evicted {removed} objects from {self.root}")
+        return removed
+
+    async def _eviction_loop(self) -> None:
+        while True:
+            try:
+                await self.evict()
+            except Exception as e:
+                logger.error(f"Storage eviction failed: {str(e)}", exc_info=True)
+            await asyncio.sleep(self.eviction_interval)
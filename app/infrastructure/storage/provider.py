@@ -0,0 +1,14 @@
+from pathlib import Path
+from app.core.config.settings import get_settings
+from app.infrastructure.storage.base import StorageBackend
+
+settings = get_settings()
+
+def get_storage_backend(namespace: str) -> StorageBackend:
+    """Build the storage backend selected by STORAGE_BACKEND for a namespace"""
+    if settings.STORAGE_BACKEND == "gcs":
+        from app.infrastructure.storage.gcs.client import GCSStorageBackend
+        return GCSStorageBackend(prefix=namespace)
+
+    from app.infrastructure.storage.local.client import LocalStorageBackend
+    return LocalStorageBackend(Path(settings.UPLOAD_DIR) / namespace)
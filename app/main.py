@@ -1,11 +1,46 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config.settings import get_settings
+from app.core.diagnostics.loop_monitor import loop_monitor
 from app.api.v1.routes import api_router
 from app.api.v1.security import security_scheme
+from app.core.security.firebase_auth import token_verifier
+from app.shared.utils.serialization import ORJSONResponse
+from app.infrastructure.ai.huggingface.warmup import ModelWarmer
+from app.infrastructure.database.redis.client import redis_client
+from app.shared.middleware.metrics import metrics_endpoint, metrics_middleware
+from app.shared.middleware.profiling import profiling_middleware
+from app.shared.middleware.rate_limiter import rate_limiter_engine
+from app.shared.middleware.request_context import request_context_middleware
+from app.core.tracing.tracer import setup_tracing
+from app.tools.base.query_cache import query_cache
+from app.tools.image_captioning.router import service as image_captioning_service
 
 settings = get_settings()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop background tasks with the application"""
+    if settings.ENABLE_LOOP_MONITOR:
+        loop_monitor.start()
+    await redis_client.connect()
+    rate_limiter_engine.start()
+    token_verifier.start()
+    query_cache.start()
+    model_warmer = ModelWarmer()
+    if settings.HUGGINGFACE_WARMUP_ENABLED:
+        model_warmer.start()
+    image_captioning_service.start()
+    yield
+    await model_warmer.stop()
+    await image_captioning_service.close()
+    await rate_limiter_engine.close()
+    await token_verifier.close()
+    await query_cache.close()
+    await redis_client.close()
+    await loop_monitor.stop()
+
 app = FastAPI(
     title=settings.APP_NAME,
     description="""
@@ -18,7 +53,9 @@ app = FastAPI(
     version="1.0.0",
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url=f"{settings.API_V1_STR}/docs",
-    redoc_url=f"{settings.API_V1_STR}/redoc"
+    redoc_url=f"{settings.API_V1_STR}/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 
@@ -32,5 +69,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Registered before the request context so profiler logs carry the request id
+if settings.ENABLE_PROFILER:
+    app.middleware("http")(profiling_middleware)
+
+app.middleware("http")(request_context_middleware)
+
+if settings.ENABLE_TRACING:
+    setup_tracing(app)
+
+if settings.ENABLE_METRICS:
+    app.middleware("http")(metrics_middleware)
+    app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+
 # Include API router with version prefix
 app.include_router(api_router, prefix=settings.API_V1_STR)
@@ -6,6 +6,7 @@ from app.infrastructure.amazon.client import AmazonClient
 from app.core.logging.logging_config import logger
 from app.shared.exceptions.base import AppException
 from app.core.config.settings import get_settings
+from app.core.tracing.tracer import tracer
 
 settings = get_settings()
 
@@ -42,11 +43,12 @@ class AIService:
         """Analyze text with relevant context from ChromaDB"""
         try:
             # Query relevant context
-            context_results = await self.chromadb.query(
-                collection_name=context_collection,
-                query_texts=[text],
-                n_results=n_context
-            )
+            with tracer.start_as_current_span("ai.retrieval", attributes={"collection": context_collection}):
+                context_results = await self.chromadb.query(
+                    collection_name=context_collection,
+                    query_texts=[text],
+                    n_results=n_context
+                )
             
             if not context_results['documents'][0]:
                 self.logger.warning(f"No context found in collection {context_collection}")
@@ -63,10 +65,11 @@ class AIService:
             context = "\n\n".join(context_results['documents'][0])
             
             # Analyze with Claude
-            analysis = await self.claude.analyze_document(
-                document=text,
-                instruction=f"Context:\n{context}\n\n{instruction}"
-            )
+            with tracer.start_as_current_span("ai.analysis"):
+                analysis = await self.claude.analyze_document(
+                    document=text,
+                    instruction=f"Context:\n{context}\n\n{instruction}"
+                )
             
             return {
                 'analysis': analysis,
@@ -93,20 +96,23 @@ class AIService:
             User Input: {user_input}
             """
             
-            keywords_response = await self.claude.generate_response(prompt)
-            keywords = [k.strip() for k in keywords_response.split(',')]
+            with tracer.start_as_current_span("ai.keyword_generation"):
+                keywords_response = await self.claude.generate_response(prompt)
+                keywords = [k.strip() for k in keywords_response.split(',')]
             
             # Search products for each keyword
             all_products = []
-            for keyword in keywords:
-                products = await self.amazon.search_items(
-                    keywords=keyword,
-                    max_results=3
-                )
-                all_products.extend(products)
+            with tracer.start_as_current_span("ai.product_search", attributes={"keywords": len(keywords)}):
+                for keyword in keywords:
+                    products = await self.amazon.search_items(
+                        keywords=keyword,
+                        max_results=3
+                    )
+                    all_products.extend(products)
             
             # Generate personalized descriptions with Claude
             recommendations = []
+            prompts = []
             for product in all_products[:max_products]:
                 prompt = f"""
                 Generate a personalized product recommendation based on the user's input and product details.
@@ -116,16 +122,19 @@ class AIService:
                 Product: {product['title']}
                 Features: {', '.join(product.get('features', []))}
                 """
-                
-                description = await self.claude.generate_response(
-                    prompt,
-                    max_tokens=200
-                )
-                
-                recommendations.append({
-                    **product,
-                    'personalized_description': description
-                })
+                prompts.append((product, prompt))
+            
+            with tracer.start_as_current_span("ai.description", attributes={"products": len(prompts)}):
+                for product, prompt in prompts:
+                    description = await self.claude.generate_response(
+                        prompt,
+                        max_tokens=200
+                    )
+                    
+                    recommendations.append({
+                        **product,
+                        'personalized_description': description
+                    })
             
             return {
                 'recommendations': recommendations,
@@ -145,20 +154,22 @@ class AIService:
         """Store document in ChromaDB and analyze it"""
         try:
             # Store in ChromaDB
-            await self.chromadb.add_documents(
-                collection_name=collection_name,
-                documents=[document],
-                metadatas=[metadata] if metadata else None
-            )
+            with tracer.start_as_current_span("ai.store", attributes={"collection": collection_name}):
+                await self.chromadb.add_documents(
+                    collection_name=collection_name,
+                    documents=[document],
+                    metadatas=[metadata] if metadata else None
+                )
             
             # Generate analysis with Claude
-            analysis = await self.claude.analyze_document(
-                document=document,
-                instruction="Provide a comprehensive analysis of this document, including:\n"
-                          "1. Main topics and themes\n"
-                          "2. Key insights\n"
-                          "3. Potential applications or recommendations"
-            )
+            with tracer.start_as_current_span("ai.analysis"):
+                analysis = await self.claude.analyze_document(
+                    document=document,
+                    instruction="Provide a comprehensive analysis of this document, including:\n"
+                              "1. Main topics and themes\n"
+                              "2. Key insights\n"
+                              "3. Potential applications or recommendations"
+                )
             
             return {
                 'analysis': analysis,
@@ -180,11 +191,12 @@ class AIService:
         """Perform semantic search with optional Claude-based reranking"""
         try:
             # Initial ChromaDB search
-            results = await self.chromadb.query(
-                collection_name=collection_name,
-                query_texts=[query],
-                n_results=n_results * 2 if rerank else n_results
-            )
+            with tracer.start_as_current_span("ai.retrieval", attributes={"collection": collection_name}):
+                results = await self.chromadb.query(
+                    collection_name=collection_name,
+                    query_texts=[query],
+                    n_results=n_results * 2 if rerank else n_results
+                )
             
             if not rerank:
                 return {
@@ -215,7 +227,8 @@ class AIService:
             {chr(10).join(f"{i+1}. {doc}" for i, doc in enumerate(documents))}
             """
             
-            rankings = await self.claude.generate_response(prompt)
+            with tracer.start_as_current_span("ai.rerank", attributes={"documents": len(documents)}):
+                rankings = await self.claude.generate_response(prompt)
             
             # Parse rankings and sort results
             ranked_results = []
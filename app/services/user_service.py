@@ -1,26 +1,124 @@
-from app.db.firestore import db
-from app.db.redis import cache_data, get_cached_data
+from typing import Dict, List, Optional
+from cachetools import TTLCache
+from app.core.config.settings import get_settings
+from app.infrastructure.database.firestore.client import async_db
+from app.infrastructure.database.redis.client import redis_client
+from app.core.logging.logging_config import logger
+from app.core.metrics.prometheus import observe_dependency, record_cache
 from app.models.user import User
 
-def get_user(user_id: str) -> User:
-    cached_user = get_cached_data(user_id)
-    if cached_user:
-        return User(**cached_user)
-    
-    user_ref = db.collection("users").document(user_id)
-    user = user_ref.get()
-    if user.exists:
-        user_data = user.to_dict()
-        cache_data(user_id, user_data)
-        return User(**user_data)
-    return None
-
-def update_user(user_id: str, user_data: dict) -> None:
-    user_ref = db.collection("users").document(user_id)
-    user_ref.update(user_data)
-    cache_data(user_id, user_data)
-
-def delete_user(user_id: str) -> None:
-    user_ref = db.collection("users").document(user_id)
-    user_ref.delete()
-    cache_data(user_id, None)
\ No newline at end of file
+settings = get_settings()
+
+# Stored in both tiers for users that do not exist
+_MISSING = b""
+
+# Hot profiles are served from process memory; Redis is shared between workers
+_local_cache: TTLCache = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_LOCAL_TTL)
+
+def _cache_key(user_id: str) -> str:
+    return f"{settings.CACHE_PREFIX}user:{user_id}"
+
+async def _store(users: Dict[str, Optional[User]]) -> None:
+    """Write lookups to both cache tiers, caching misses negatively"""
+    found = {}
+    missing = {}
+    for user_id, user in users.items():
+        _local_cache[user_id] = user or _MISSING
+        if user:
+            found[_cache_key(user_id)] = user.model_dump_json()
+        else:
+            missing[_cache_key(user_id)] = _MISSING
+
+    try:
+        if found:
+            await redis_client.set_many(found, ttl=settings.USER_CACHE_TTL)
+        if missing:
+            await redis_client.set_many(missing, ttl=settings.USER_CACHE_NEGATIVE_TTL)
+    except Exception as e:
+        logger.warning(f"User cache write failed: {str(e)}")
+
+async def _invalidate(user_id: str) -> None:
+    """Drop a user from both cache tiers"""
+    _local_cache.pop(user_id, None)
+    try:
+        await redis_client.delete(_cache_key(user_id))
+    except Exception as e:
+        logger.warning(f"User cache invalidation failed for {user_id}: {str(e)}")
+
+async def get_user(user_id: str) -> Optional[User]:
+    cached = _local_cache.get(user_id)
+    record_cache("user_local", cached is not None)
+    if cached is not None:
+        return None if cached is _MISSING else cached
+
+    try:
+        payload = await redis_client.get(_cache_key(user_id))
+    except Exception as e:
+        logger.warning(f"User cache read failed for {user_id}: {str(e)}")
+        payload = None
+
+    record_cache("user_redis", payload is not None)
+    if payload is not None:
+        user = User.model_validate_json(payload) if payload else None
+        _local_cache[user_id] = user or _MISSING
+        return user
+
+    async with observe_dependency("firestore", "get_user"):
+        snapshot = await async_db.collection("users").document(user_id).get()
+    user = User(**snapshot.to_dict()) if snapshot.exists else None
+    await _store({user_id: user})
+    return user
+
+async def get_users(user_ids: List[str]) -> Dict[str, Optional[User]]:
+    """Look up many users with at most one Redis and one Firestore round-trip"""
+    users: Dict[str, Optional[User]] = {}
+    pending = []
+    for user_id in dict.fromkeys(user_ids):
+        cached = _local_cache.get(user_id)
+        record_cache("user_local", cached is not None)
+        if cached is None:
+            pending.append(user_id)
+        else:
+            users[user_id] = None if cached is _MISSING else cached
+
+    if pending:
+        try:
+            payloads = await redis_client.get_many([_cache_key(user_id) for user_id in pending])
+        except Exception as e:
+            logger.warning(f"User cache read failed: {str(e)}")
+            payloads = [None] * len(pending)
+
+        remaining = []
+        for user_id, payload in zip(pending, payloads):
+            record_cache("user_redis", payload is not None)
+            if payload is None:
+                remaining.append(user_id)
+                continue
+            user = User.model_validate_json(payload) if payload else None
+            _local_cache[user_id] = user or _MISSING
+            users[user_id] = user
+        pending = remaining
+
+    if pending:
+        collection = async_db.collection("users")
+        fetched: Dict[str, Optional[User]] = dict.fromkeys(pending)
+        async with observe_dependency("firestore", "get_users"):
+            async for snapshot in async_db.get_all([collection.document(user_id) for user_id in pending]):
+                if snapshot.exists:
+                    fetched[snapshot.id] = User(**snapshot.to_dict())
+        await _store(fetched)
+        users.update(fetched)
+
+    return users
+
+async def update_user(user_id: str, user_data: dict) -> None:
+    user_ref = async_db.collection("users").document(user_id)
+    async with observe_dependency("firestore", "update_user"):
+        await user_ref.update(user_data)
+    await _invalidate(user_id)
+
+async def delete_user(user_id: str) -> None:
+    user_ref = async_db.collection("users").document(user_id)
+    async with observe_dependency("firestore", "delete_user"):
+        await user_ref.delete()
+    await _invalidate(user_id)
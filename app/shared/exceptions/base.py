@@ -27,3 +27,7 @@ class AuthorizationError(AppException):
 class NotFoundError(AppException):
     def __init__(self, message: str, extra: Optional[Dict[str, Any]] = None):
         super().__init__(message, status_code=404, extra=extra)
+
+class ServiceUnavailableError(AppException):
+    def __init__(self, message: str, extra: Optional[Dict[str, Any]] = None):
+        super().__init__(message, status_code=503, extra=extra)
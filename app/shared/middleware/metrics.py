@@ -0,0 +1,39 @@
+import time
+from fastapi import Request, Response
+from starlette.routing import Match
+from app.core.metrics.prometheus import (
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS_IN_PROGRESS,
+    METRICS_CONTENT_TYPE,
+    render_metrics
+)
+
+def _route_template(request: Request) -> str:
+    """Path template of the matching route, keeping label cardinality bounded"""
+    for route in request.app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return getattr(route, "path", request.url.path)
+    return "unmatched"
+
+async def metrics_middleware(request: Request, call_next: callable) -> Response:
+    """Record per-route latency and in-flight requests
+
+    For streaming responses the latency covers time to the response headers.
+    """
+    route = _route_template(request)
+    in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(request.method, route)
+    in_progress.inc()
+    start_time = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        HTTP_REQUEST_DURATION.labels(request.method, route, str(status)).observe(time.perf_counter() - start_time)
+        in_progress.dec()
+
+async def metrics_endpoint(request: Request) -> Response:
+    """Prometheus scrape endpoint"""
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
@@ -0,0 +1,54 @@
+import threading
+from fastapi import HTTPException, Request, Response
+from fastapi.security import HTTPAuthorizationCredentials
+from app.core.diagnostics.profiler import (
+    PROFILE_HEADER, PROFILE_ID_HEADER, SamplingProfiler, profile_store
+)
+from app.core.logging.logging_config import logger
+from app.core.security.session import verify_token
+
+async def _profiling_admin(request: Request):
+    """Return the caller's token data if they are an admin, otherwise None"""
+    scheme, _, credentials = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not credentials:
+        return None
+    try:
+        token_data = await verify_token(
+            request, HTTPAuthorizationCredentials(scheme=scheme, credentials=credentials)
+        )
+    except HTTPException:
+        return None
+    return token_data if token_data.get("admin", False) else None
+
+async def profiling_middleware(request: Request, call_next: callable) -> Response:
+    """Sample the event loop thread for the duration of a request on demand
+
+    Only admins can trigger it with the X-Profile header; the profile id is
+    returned in X-Profile-ID and the result is served by /diagnostics/profiles.
+    """
+    if not request.headers.get(PROFILE_HEADER):
+        return await call_next(request)
+
+    token_data = await _profiling_admin(request)
+    if token_data is None or not profile_store.try_begin():
+        return await call_next(request)
+
+    profiler = SamplingProfiler(threading.get_ident())
+    try:
+        profiler.start()
+        try:
+            response = await call_next(request)
+        finally:
+            profiler.stop()
+    finally:
+        profile_store.end()
+
+    profile_id = await profile_store.add(
+        request.method, request.url.path, token_data.get("uid"), profiler
+    )
+    logger.info(
+        f"Profiled {request.method} {request.url.path}: {profiler.samples} samples",
+        extra={"profile_id": profile_id}
+    )
+    response.headers[PROFILE_ID_HEADER] = profile_id
+    return response
@@ -1,16 +1,316 @@
+import asyncio
+import math
+import time
 from fastapi import Request
 from fastapi.responses import JSONResponse
+from app.core.config.settings import get_settings
+from app.core.logging.logging_config import logger
+from app.core.metrics.prometheus import observe_dependency
 from app.infrastructure.database.redis.client import redis_client
-import time
-from typing import Optional
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+settings = get_settings()
+
+# Token bucket over every key in KEYS, checked and updated atomically in one round-trip.
+# A request is admitted only if every bucket holds `cost` tokens; then all are charged.
+# In partial mode as many tokens as every bucket can spare (up to `cost`) are granted
+# instead, which is how local workers lease chunks of quota. A negative cost refunds
+# unused tokens, capped at capacity.
+# ARGV: capacity, refill rate (tokens/second), cost, key TTL (seconds), partial (0/1)
+# Returns: {granted tokens, remaining tokens of the tightest bucket, seconds until admitted}
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local ttl = tonumber(ARGV[4])
+local partial = tonumber(ARGV[5]) == 1
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+
+local levels = {}
+local lowest = capacity
+for i, key in ipairs(KEYS) do
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local level = tonumber(state[1])
+    local ts = tonumber(state[2])
+    if level == nil then
+        level = capacity
+        ts = now
+    end
+    level = math.min(capacity, level + math.max(0, now - ts) * rate)
+    levels[i] = level
+    lowest = math.min(lowest, level)
+end
+
+local granted = cost
+if partial then
+    granted = math.max(0, math.min(cost, math.floor(lowest)))
+elseif lowest < cost then
+    granted = 0
+end
+local retry_after = 0
+if granted == 0 and cost > 0 then
+    local needed = 1
+    if not partial then
+        needed = cost
+    end
+    retry_after = math.max(0, (needed - lowest) / rate)
+end
+
+local remaining = capacity
+for i, key in ipairs(KEYS) do
+    local level = math.min(capacity, levels[i] - granted)
+    redis.call('HSET', key, 'tokens', level, 'ts', now)
+    redis.call('EXPIRE', key, ttl)
+    remaining = math.min(remaining, level)
+end
+
+return {granted, tostring(remaining), tostring(retry_after)}
+"""
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float
+    retry_after: float
+    granted: int = 0
+
+    def headers(self) -> Dict[str, str]:
+        """Standard rate limit response headers"""
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(math.ceil(self.reset_after))
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(math.ceil(self.retry_after))
+        return headers
+
+class TokenBucketLimiter:
+    """
+    Rate limiting engine backed by a server-side Lua token bucket
+
+    ``requests`` tokens refill evenly over ``period`` seconds and a bucket holds
+    at most ``requests + burst`` tokens. All keys of a call (e.g. IP and user)
+    are checked and charged atomically in a single round-trip.
+    """
+
+    def __init__(self, key_prefix: str = f"{settings.CACHE_PREFIX}rate_limit"):
+        self.key_prefix = key_prefix
+        self._script = None
+
+    async def acquire(
+        self,
+        keys: List[str],
+        requests: int,
+        period: int = 60,
+        burst: Optional[int] = None,
+        cost: int = 1,
+        partial: bool = False
+    ) -> RateLimitResult:
+        """Try to take ``cost`` tokens from every bucket in keys
+
+        With ``partial`` the call succeeds with fewer tokens when fewer are
+        available; ``granted`` on the result says how many were taken.
+        """
+        capacity = requests + (settings.RATE_LIMIT_BURST if burst is None else burst)
+        rate = requests / period
+        if not keys or not settings.RATE_LIMIT_ENABLED:
+            return RateLimitResult(True, requests, capacity, 0.0, 0.0, cost)
+
+        if self._script is None:
+            self._script = redis_client.client.register_script(TOKEN_BUCKET_SCRIPT)
+
+        try:
+            async with observe_dependency("redis", "token_bucket"):
+                granted, remaining, retry_after = await self._script(
+                    keys=[f"{self.key_prefix}:{key}" for key in keys],
+                    args=[capacity, rate, cost, math.ceil(capacity / rate) + 1, int(partial)]
+                )
+        except Exception as e:
+            # Fail open: losing Redis must not take the API down with it
+            logger.error(f"Rate limiter unavailable: {str(e)}")
+            return RateLimitResult(True, requests, capacity, 0.0, 0.0, cost)
+
+        remaining = float(remaining)
+        return RateLimitResult(
+            allowed=int(granted) > 0 if cost > 0 else True,
+            limit=requests,
+            remaining=max(0, math.floor(remaining)),
+            reset_after=(capacity - remaining) / rate,
+            retry_after=float(retry_after),
+            granted=int(granted)
+        )
+
+    def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+class _Lease:
+    """Tokens a worker took from a Redis bucket in advance"""
+    __slots__ = ("tokens", "remaining", "expires_at")
+
+    def __init__(self, tokens: int, remaining: int, expires_at: float):
+        self.tokens = tokens
+        self.remaining = remaining
+        self.expires_at = expires_at
+
+class HybridRateLimiter:
+    """
+    Two-tier limiter: per-worker token leases in front of the Redis token bucket
+
+    Each worker leases a chunk of tokens from the shared bucket in one round-trip
+    and admits requests from it locally until the chunk is spent or the lease
+    expires. Unless ``lease_ttl`` is set, a lease lives as long as the bucket
+    takes to refill the chunk, so a quiet key still needs only one round-trip
+    per chunk. Leased tokens are charged to the bucket up front, so the
+    long-run rate is never exceeded; the overshoot is bounded by tokens a
+    worker still holds from an earlier refill, at most one lease per worker and
+    key within its lifetime. Unused tokens of expired leases are refunded by a
+    periodic reconciliation task, never on the request path.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[TokenBucketLimiter] = None,
+        lease_size: Optional[int] = None,
+        lease_ttl: Optional[float] = None,
+        sync_interval: Optional[float] = None
+    ):
+        self.backend = backend or TokenBucketLimiter()
+        self.lease_size = lease_size or settings.RATE_LIMIT_LEASE_SIZE
+        self.lease_ttl = lease_ttl or settings.RATE_LIMIT_LEASE_TTL
+        self.sync_interval = sync_interval or settings.RATE_LIMIT_SYNC_INTERVAL
+        self._leases: Dict[Tuple, _Lease] = {}
+        # Leases replaced on the request path, refunded by the sync loop
+        self._expired: List[Tuple[Tuple, _Lease]] = []
+        self._locks: Dict[Tuple, asyncio.Lock] = {}
+        self._sync_task: Optional[asyncio.Task] = None
+
+    async def acquire(
+        self,
+        keys: List[str],
+        requests: int,
+        period: int = 60,
+        burst: Optional[int] = None,
+        cost: int = 1
+    ) -> RateLimitResult:
+        """Admit from the local lease when possible, leasing a new chunk otherwise"""
+        if not keys or not settings.RATE_LIMIT_ENABLED:
+            return await self.backend.acquire(keys, requests, period, burst, cost)
+
+        lease_key = (tuple(keys), requests, period, burst)
+        result = self._take(lease_key, requests, cost)
+        if result is not None:
+            return result
+
+        lock = self._locks.setdefault(lease_key, asyncio.Lock())
+        async with lock:
+            # Another request may have renewed the lease while we waited
+            result = self._take(lease_key, requests, cost)
+            if result is not None:
+                return result
+
+            self._defer_refund(lease_key, self._leases.pop(lease_key, None))
+            capacity = requests + (settings.RATE_LIMIT_BURST if burst is None else burst)
+            chunk = max(cost, min(self.lease_size, capacity // 10))
+            leased = await self.backend.acquire(keys, requests, period, burst, cost=chunk, partial=True)
+            if leased.granted < cost:
+                self._defer_refund(lease_key, _Lease(leased.granted, 0, 0.0))
+                return leased._replace(allowed=False)
+
+            lease_ttl = self.lease_ttl or chunk * period / requests
+            self._leases[lease_key] = _Lease(
+                leased.granted - cost,
+                leased.remaining,
+                time.monotonic() + lease_ttl
+            )
+            return leased._replace(remaining=leased.remaining + leased.granted - cost)
+
+    def start(self) -> None:
+        """Start periodic reconciliation of expired leases"""
+        if self._sync_task is None:
+            self._sync_task = asyncio.create_task(self._sync_loop(), name="rate-limit-sync")
+
+    async def close(self) -> None:
+        """Stop reconciliation and refund every outstanding lease"""
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            try:
+                await self._sync_task
+            except asyncio.CancelledError:
+                pass
+            self._sync_task = None
+        for lease_key in list(self._leases):
+            self._defer_refund(lease_key, self._leases.pop(lease_key))
+        await self._refund_expired()
+
+    def _take(self, lease_key: Tuple, requests: int, cost: int) -> Optional[RateLimitResult]:
+        lease = self._leases.get(lease_key)
+        if lease is None or lease.tokens < cost or lease.expires_at <= time.monotonic():
+            return None
+        lease.tokens -= cost
+        return RateLimitResult(True, requests, lease.remaining + lease.tokens, 0.0, 0.0, cost)
+
+    def _defer_refund(self, lease_key: Tuple, lease: Optional[_Lease]) -> None:
+        if lease is not None and lease.tokens > 0:
+            self._expired.append((lease_key, lease))
+
+    async def _refund_expired(self) -> None:
+        expired, self._expired = self._expired, []
+        for lease_key, lease in expired:
+            try:
+                await self._refund(lease_key, lease)
+            except Exception as e:
+                logger.warning(f"Rate limit lease refund failed: {str(e)}")
+
+    async def _refund(self, lease_key: Tuple, lease: Optional[_Lease]) -> None:
+        if lease is None or lease.tokens <= 0:
+            return
+        keys, requests, period, burst = lease_key
+        await self.backend.acquire(list(keys), requests, period, burst, cost=-lease.tokens)
+        lease.tokens = 0
+
+    async def _sync_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            await self._refund_expired()
+            now = time.monotonic()
+            for lease_key, lease in list(self._leases.items()):
+                if lease.expires_at > now:
+                    continue
+                lock = self._locks.get(lease_key)
+                if lock is not None and lock.locked():
+                    continue
+                if self._leases.get(lease_key) is lease:
+                    del self._leases[lease_key]
+                    self._locks.pop(lease_key, None)
+                try:
+                    await self._refund(lease_key, lease)
+                except Exception as e:
+                    logger.warning(f"Rate limit lease refund failed: {str(e)}")
+
+            # Drop locks of keys that were denied and never got a lease
+            for lease_key, lock in list(self._locks.items()):
+                if lease_key not in self._leases and not lock.locked():
+                    del self._locks[lease_key]
+
+rate_limiter_engine = (
+    HybridRateLimiter() if settings.RATE_LIMIT_MODE == "hybrid" else TokenBucketLimiter()
+)
 
 class RateLimiter:
     def __init__(
         self,
-        requests_per_minute: int = 60,
-        key_prefix: str = "rate_limit"
+        requests_per_minute: int = settings.RATE_LIMIT_PER_MINUTE,
+        burst: int = settings.RATE_LIMIT_BURST,
+        key_prefix: str = "ip"
     ):
         self.requests_per_minute = requests_per_minute
+        self.burst = burst
         self.key_prefix = key_prefix
 
     async def __call__(
@@ -19,26 +319,23 @@ class RateLimiter:
         call_next: callable
     ):
         client_ip = request.client.host
-        key = f"{self.key_prefix}:{client_ip}"
-        
-        # Get current request count
-        current = redis_client.get(key)
-        current_count = int(current) if current else 0
+        result = await rate_limiter_engine.acquire(
+            [f"{self.key_prefix}:{client_ip}"],
+            requests=self.requests_per_minute,
+            period=60,
+            burst=self.burst
+        )
         
-        if current_count >= self.requests_per_minute:
+        if not result.allowed:
             return JSONResponse(
                 status_code=429,
                 content={
                     "error": "Too many requests",
-                    "retry_after": "60 seconds"
-                }
+                    "retry_after": f"{math.ceil(result.retry_after)} seconds"
+                },
+                headers=result.headers()
             )
         
-        # Increment request count
-        pipe = redis_client.pipeline()
-        pipe.incr(key)
-        if not current:
-            pipe.expire(key, 60)  # Reset after 1 minute
-        pipe.execute()
-        
-        return await call_next(request) 
\ No newline at end of file
+        response = await call_next(request)
+        response.headers.update(result.headers())
+        return response
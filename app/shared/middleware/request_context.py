@@ -0,0 +1,16 @@
+import uuid
+from fastapi import Request, Response
+from opentelemetry import trace
+from app.core.tracing.context import request_id_var
+
+async def request_context_middleware(request: Request, call_next: callable) -> Response:
+    """Assign a request id, expose it to logs and traces, and echo it back"""
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    token = request_id_var.set(request_id)
+    trace.get_current_span().set_attribute("request.id", request_id)
+    try:
+        response = await call_next(request)
+    finally:
+        request_id_var.reset(token)
+    response.headers["X-Request-ID"] = request_id
+    return response
@@ -1,15 +1,26 @@
+import logging
+import time
 from functools import wraps
-from typing import List, Optional, Callable
-from fastapi import HTTPException, Request
+from typing import Any, Dict, List, Optional, Callable, Tuple
+from fastapi import HTTPException, Request, Response
 from app.shared.exceptions.base import AuthenticationError, AuthorizationError
 from app.core.logging.logging_config import logger
+from app.core.logging.policy import CappedRepr, log_success
+
+def _find_argument(args: Tuple[Any, ...], kwargs: Dict[str, Any], cls: type) -> Optional[Any]:
+    """Find the first positional or keyword argument of a given type
+
+    FastAPI calls endpoints with keyword arguments only, so endpoints using
+    these decorators must declare a ``Request`` parameter.
+    """
+    return next((arg for arg in (*args, *kwargs.values()) if isinstance(arg, cls)), None)
 
 def require_auth():
     """Decorator to require authentication for endpoints"""
     def decorator(func: Callable):
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            request = next((arg for arg in args if isinstance(arg, Request)), None)
+            request = _find_argument(args, kwargs, Request)
             if not request:
                 raise AuthenticationError("No request object found")
 
@@ -26,7 +37,7 @@ def require_roles(roles: List[str]):
     def decorator(func: Callable):
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            request = next((arg for arg in args if isinstance(arg, Request)), None)
+            request = _find_argument(args, kwargs, Request)
             if not request:
                 raise AuthenticationError("No request object found")
 
@@ -46,69 +57,80 @@ def rate_limit(
     requests: int,
     period: int = 60,
     by_ip: bool = True,
-    by_user: bool = False
+    by_user: bool = False,
+    burst: Optional[int] = None
 ):
-    """Decorator for rate limiting specific endpoints"""
+    """Decorator for rate limiting specific endpoints
+
+    All keys (IP and user) are checked and charged atomically in one Redis
+    round-trip. Rate limit headers are set on a ``Response`` parameter if the
+    endpoint declares one, and on the 429 error otherwise.
+    """
     def decorator(func: Callable):
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            from app.infrastructure.database.redis.client import redis_client
-            request = next((arg for arg in args if isinstance(arg, Request)), None)
+            from app.shared.middleware.rate_limiter import rate_limiter_engine
+            request = _find_argument(args, kwargs, Request)
             
             if not request:
                 return await func(*args, **kwargs)
 
             keys = []
             if by_ip:
-                keys.append(f"rate_limit:ip:{request.client.host}")
-            if by_user and hasattr(request.state, "token_data"):
-                keys.append(f"rate_limit:user:{request.state.token_data['uid']}")
-
-            for key in keys:
-                current = redis_client.get(key)
-                if current and int(current) >= requests:
-                    raise HTTPException(
-                        status_code=429,
-                        detail=f"Rate limit exceeded. Try again in {period} seconds"
-                    )
-                redis_client.incr(key)
-                redis_client.expire(key, period)
+                keys.append(f"ip:{request.client.host}")
+            token_data = getattr(request.state, "token_data", None)
+            if by_user and token_data:
+                keys.append(f"user:{token_data['uid']}")
+
+            result = await rate_limiter_engine.acquire(
+                keys,
+                requests=requests,
+                period=period,
+                burst=burst
+            )
+            if not result.allowed:
+                raise HTTPException(
+                    status_code=429,
+                    detail=f"Rate limit exceeded. Try again in {int(result.retry_after) + 1} seconds",
+                    headers=result.headers()
+                )
+
+            response = _find_argument(args, kwargs, Response)
+            if response is not None:
+                response.headers.update(result.headers())
 
             return await func(*args, **kwargs)
         return wrapper
     return decorator
 
 def log_execution(include_args: bool = False):
-    """Decorator to log function execution with timing"""
+    """Decorator to log function execution with timing
+
+    Entry is logged at DEBUG; completions are sampled unless slow, and
+    arguments are only rendered, size-capped, if a record is written.
+    """
     def decorator(func: Callable):
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            import time
-            start_time = time.time()
+            start_time = time.perf_counter()
             
-            # Log function entry
+            # Keys must not collide with LogRecord attributes (module, args, ...)
             log_data = {
-                "function": func.__name__,
-                "module": func.__module__
+                "func_name": func.__name__,
+                "func_module": func.__module__
             }
             
             if include_args:
-                log_data["args"] = str(args)
-                log_data["kwargs"] = str(kwargs)
+                log_data["call_args"] = CappedRepr(args)
+                log_data["call_kwargs"] = CappedRepr(kwargs)
             
-            logger.info(f"Executing {func.__name__}", extra=log_data)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Executing {func.__name__}", extra=log_data)
             
             try:
                 result = await func(*args, **kwargs)
-                execution_time = (time.time() - start_time) * 1000
-                
-                logger.info(
-                    f"Completed {func.__name__}",
-                    extra={
-                        **log_data,
-                        "execution_time_ms": execution_time
-                    }
-                )
+                execution_time = (time.perf_counter() - start_time) * 1000
+                log_success(logger, f"Completed {func.__name__}", execution_time, **log_data)
                 return result
                 
             except Exception as e:
@@ -5,6 +5,7 @@ from datetime import datetime, date
 from uuid import UUID
 import hashlib
 from pathlib import Path
+from app.shared.utils.serialization import dumps_str
 
 def validate_email(email: str) -> bool:
     """Validate email format"""
@@ -62,7 +63,7 @@ class JSONEncoder(json.JSONEncoder):
 
 def safe_json_dumps(obj: Any) -> str:
     """Safely serialize object to JSON string"""
-    return json.dumps(obj, cls=JSONEncoder)
+    return dumps_str(obj)
 
 def chunk_list(lst: List[Any], chunk_size: int) -> List[List[Any]]:
     """Split list into chunks of specified size"""
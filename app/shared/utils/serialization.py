@@ -0,0 +1,44 @@
+# app/shared/utils/serialization.py
+from datetime import date, datetime
+from typing import Any, Callable
+from uuid import UUID
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+# Dict keys may be ints, enums, datetimes, etc., as with the stdlib encoder
+DEFAULT_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+def _default(obj: Any) -> Any:
+    """Types orjson does not handle natively, matching helpers.JSONEncoder
+
+    orjson only serializes exact datetime/UUID types, so subclasses such as
+    Firestore's DatetimeWithNanoseconds end up here.
+    """
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, bytes):
+        return obj.decode('utf-8')
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(obj: Any, sort_keys: bool = False, default: Callable[[Any], Any] = _default) -> bytes:
+    """Serialize to JSON bytes; pass ``default=str`` to stringify unknown types"""
+    options = DEFAULT_OPTIONS | orjson.OPT_SORT_KEYS if sort_keys else DEFAULT_OPTIONS
+    return orjson.dumps(obj, default=default, option=options)
+
+def dumps_str(obj: Any, sort_keys: bool = False, default: Callable[[Any], Any] = _default) -> str:
+    """Serialize to a JSON string"""
+    return dumps(obj, sort_keys=sort_keys, default=default).decode('utf-8')
+
+def loads(data: Any) -> Any:
+    """Parse JSON from bytes or str"""
+    return orjson.loads(data)
+
+class ORJSONResponse(JSONResponse):
+    """Default response class; renders with orjson"""
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
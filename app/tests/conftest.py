@@ -1,9 +1,19 @@
+import os
+
+# Trace every request under test, in memory only
+os.environ["ENABLE_TRACING"] = "true"
+os.environ["OTEL_EXPORTER_OTLP_ENDPOINT"] = ""
+os.environ["OTEL_SAMPLE_RATIO"] = "1.0"
+
 import pytest
 from fastapi.testclient import TestClient
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
 from app.main import app
 from app.infrastructure.database.firestore.client import db
 from app.infrastructure.database.redis.client import redis_client
-import os
 import json
 
 @pytest.fixture
@@ -41,10 +51,31 @@ def mock_redis(monkeypatch):
         def __init__(self):
             self.data = {}
             
-        def get(self, key):
+        async def get(self, key):
             return self.data.get(key)
             
-        def setex(self, key, exp, value):
+        async def set(self, key, value, ttl=None):
             self.data[key] = value
             
-    monkeypatch.setattr("app.infrastructure.database.redis.client.redis_client", MockRedis()) 
\ No newline at end of file
+        async def get_many(self, keys):
+            return [self.data.get(key) for key in keys]
+            
+    monkeypatch.setattr("app.infrastructure.database.redis.client.redis_client", MockRedis()) 
+
+@pytest.fixture(scope="session")
+def _span_exporter():
+    exporter = InMemorySpanExporter()
+    provider = trace.get_tracer_provider()
+    if not isinstance(provider, TracerProvider):
+        # Only the API's proxy is installed; it cannot take span processors
+        provider = TracerProvider()
+        trace.set_tracer_provider(provider)
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return exporter
+
+@pytest.fixture
+def span_exporter(_span_exporter):
+    """Finished spans of the current test, kept in memory instead of exported"""
+    _span_exporter.clear()
+    yield _span_exporter
+    _span_exporter.clear()
@@ -0,0 +1,110 @@
+import logging
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from opentelemetry import trace
+from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+from opentelemetry.trace import SpanKind
+from app.core.config.settings import get_settings
+from app.core.logging.logging_config import RequestIdFilter, logger
+from app.services.ai_service import AIService
+from app.shared.middleware.request_context import request_context_middleware
+
+settings = get_settings()
+
+AI_STAGES = ["ai.retrieval", "ai.rerank", "ai.keyword_generation", "ai.product_search", "ai.description"]
+
+class FakeClaude:
+    async def generate_response(self, prompt: str, max_tokens: int = 1000) -> str:
+        if "search keywords" in prompt:
+            return "books, bookmarks"
+        if "Rate each document" in prompt:
+            return "90|relevant\n10|unrelated"
+        return "A thoughtful gift."
+
+class FakeChromaDB:
+    async def query(self, collection_name, query_texts, n_results):
+        return {
+            "documents": [["first", "second"]],
+            "metadatas": [[{}, {}]],
+            "distances": [[0.1, 0.2]]
+        }
+
+class FakeAmazon:
+    async def search_items(self, keywords: str, max_results: int = 3):
+        return [{"title": f"{keywords} item", "features": ["paperback"]}]
+
+class CaptureHandler(logging.Handler):
+    """Collects records after the same filter the queue handlers use"""
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.addFilter(RequestIdFilter())
+
+    def emit(self, record):
+        self.records.append(record)
+
+@pytest.fixture
+def ai_client(span_exporter):
+    """Instrumented app serving AIService backed by fake clients"""
+    service = object.__new__(AIService)
+    service.claude = FakeClaude()
+    service.chromadb = FakeChromaDB()
+    service.amazon = FakeAmazon()
+    service.logger = logger
+
+    ai_app = FastAPI()
+    ai_app.middleware("http")(request_context_middleware)
+
+    @ai_app.post("/recommend")
+    async def recommend():
+        logger.info("Generating recommendations")
+        recommendations = await service.generate_product_recommendations("a gift for a reader", max_products=2)
+        search = await service.semantic_search("books", "products", n_results=1)
+        return {**recommendations, **search}
+
+    FastAPIInstrumentor.instrument_app(ai_app, tracer_provider=trace.get_tracer_provider())
+    yield TestClient(ai_app)
+    FastAPIInstrumentor.uninstrument_app(ai_app)
+
+def _server_span(spans):
+    return next(span for span in spans if span.kind == SpanKind.SERVER)
+
+def test_route_span(test_client, span_exporter):
+    response = test_client.get(f"{settings.API_V1_STR}/health")
+
+    assert response.status_code == 200
+    server_span = _server_span(span_exporter.get_finished_spans())
+    assert server_span.attributes["http.route"] == f"{settings.API_V1_STR}/health"
+
+def test_ai_stage_spans_nest_under_route(ai_client, span_exporter):
+    response = ai_client.post("/recommend")
+
+    assert response.status_code == 200
+    spans = span_exporter.get_finished_spans()
+    by_id = {span.context.span_id: span for span in spans}
+    server_span = _server_span(spans)
+
+    def ancestors(span):
+        while span.parent is not None and span.parent.span_id in by_id:
+            span = by_id[span.parent.span_id]
+            yield span.context.span_id
+
+    for name in AI_STAGES:
+        stage = next(span for span in spans if span.name == name)
+        assert stage.context.trace_id == server_span.context.trace_id
+        assert server_span.context.span_id in ancestors(stage), name
+
+def test_log_records_carry_trace_and_request_ids(ai_client, span_exporter):
+    handler = CaptureHandler()
+    logger.addHandler(handler)
+    try:
+        response = ai_client.post("/recommend", headers={"X-Request-ID": "req-123"})
+    finally:
+        logger.removeHandler(handler)
+
+    assert response.headers["X-Request-ID"] == "req-123"
+    record = next(record for record in handler.records if record.getMessage() == "Generating recommendations")
+    server_span = _server_span(span_exporter.get_finished_spans())
+    assert record.request_id == "req-123"
+    assert record.trace_id == format(server_span.context.trace_id, "032x")
@@ -0,0 +1,124 @@
+# app/tools/base/bulk.py
+import asyncio
+import random
+from typing import Any, Dict, List, NamedTuple, Optional
+from google.api_core import exceptions as gcp_exceptions
+from pydantic import BaseModel
+from app.core.config.settings import get_settings
+from app.core.logging.logging_config import logger
+from app.core.metrics.prometheus import observe_dependency, record_retry
+from app.shared.utils.helpers.general_helpers import chunk_list
+
+settings = get_settings()
+
+# Errors worth retrying; anything else is a problem with the write itself
+TRANSIENT_ERRORS = (
+    gcp_exceptions.Aborted,
+    gcp_exceptions.DeadlineExceeded,
+    gcp_exceptions.InternalServerError,
+    gcp_exceptions.ResourceExhausted,
+    gcp_exceptions.ServiceUnavailable
+)
+
+class WriteOperation(NamedTuple):
+    index: int
+    doc_ref: Any
+    op: str  # "set", "update" or "delete"
+    data: Optional[Dict[str, Any]] = None
+
+class BulkWriteError(BaseModel):
+    index: int
+    id: Optional[str] = None
+    error: str
+
+class BulkWriteResult(BaseModel):
+    items: List[Any]
+    errors: List[BulkWriteError] = []
+
+class ChunkedBulkWriter:
+    """
+    Commits any number of writes as Firestore batches
+
+    Operations are split into batches under Firestore's 500-write limit and
+    committed with bounded parallelism. A batch that keeps failing is
+    replayed write by write, so only the writes that actually fail are
+    reported, each with its own error. Replayed writes share one concurrency
+    limit across all chunks, since they happen while Firestore is already
+    rejecting writes.
+    """
+
+    def __init__(
+        self,
+        db: Any,
+        chunk_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        replay_concurrency: Optional[int] = None
+    ):
+        self.db = db
+        self.chunk_size = min(chunk_size or settings.FIRESTORE_BATCH_SIZE, 500)
+        self.max_concurrency = max_concurrency or settings.FIRESTORE_BULK_CONCURRENCY
+        self.max_retries = settings.FIRESTORE_BULK_RETRIES if max_retries is None else max_retries
+        self.replay_concurrency = replay_concurrency or settings.FIRESTORE_BULK_REPLAY_CONCURRENCY
+
+    async def write(self, operations: List[WriteOperation]) -> Dict[int, str]:
+        """Apply all operations; returns error messages keyed by operation index"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        replay_semaphore = asyncio.Semaphore(self.replay_concurrency)
+        errors: Dict[int, str] = {}
+
+        async def run(chunk: List[WriteOperation]) -> None:
+            async with semaphore:
+                errors.update(await self._write_chunk(chunk, replay_semaphore))
+
+        await asyncio.gather(*(run(chunk) for chunk in chunk_list(operations, self.chunk_size)))
+        return errors
+
+    async def _write_chunk(self, chunk: List[WriteOperation], replay_semaphore: asyncio.Semaphore) -> Dict[int, str]:
+        try:
+            await self._with_retries(self._commit, chunk)
+            return {}
+        except Exception as e:
+            logger.warning(
+                f"Batch of {len(chunk)} writes failed, retrying individually: {str(e)}",
+                extra={"chunk_size": len(chunk)}
+            )
+
+        # A batch is atomic, so one bad write fails the rest; isolate it
+        async def replay(operation: WriteOperation) -> None:
+            async with replay_semaphore:
+                await self._with_retries(self._apply, operation)
+
+        results = await asyncio.gather(*(replay(operation) for operation in chunk), return_exceptions=True)
+        return {
+            operation.index: str(result)
+            for operation, result in zip(chunk, results)
+            if isinstance(result, Exception)
+        }
+
+    async def _with_retries(self, func, arg) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await func(arg)
+            except TRANSIENT_ERRORS:
+                if attempt == self.max_retries:
+                    raise
+                record_retry("firestore", func.__name__.lstrip("_"))
+                await asyncio.sleep(min(2 ** attempt * 0.1, 2.0) * (1 + random.random()))
+
+    async def _commit(self, chunk: List[WriteOperation]) -> None:
+        batch = self.db.batch()
+        for operation in chunk:
+            if operation.op == "delete":
+                batch.delete(operation.doc_ref)
+            else:
+                getattr(batch, operation.op)(operation.doc_ref, operation.data)
+        async with observe_dependency("firestore", "batch_commit"):
+            await batch.commit()
+
+    async def _apply(self, operation: WriteOperation) -> None:
+        async with observe_dependency("firestore", operation.op):
+            if operation.op == "delete":
+                await operation.doc_ref.delete()
+            else:
+                await getattr(operation.doc_ref, operation.op)(operation.data)
@@ -1,9 +1,13 @@
 # app/tools/base/controller.py
-from typing import Any, Dict, Generic, List, Optional, TypeVar
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, Generic, List, Optional, TypeVar
 from fastapi import HTTPException, Request
+from fastapi.responses import StreamingResponse
 from app.shared.exceptions.base import AppException, NotFoundError
 from app.core.logging.logging_config import logger
-from app.shared.utils.helpers.general_helpers import format_response
+from app.core.logging.policy import CappedRepr, log_success
+from app.shared.utils.helpers.general_helpers import format_response, safe_json_dumps
 from pydantic import BaseModel
 
 T = TypeVar('T', bound=BaseModel)
@@ -22,26 +26,28 @@ class BaseController(Generic[T]):
     async def handle_request(self, operation: str, *args, **kwargs) -> Dict[str, Any]:
         """Generic request handler with logging and error handling"""
         request_id = kwargs.get('request_id', 'unknown')
+        start_time = time.perf_counter()
         
         try:
-            self.logger.info(
-                f"Handling {operation} request",
-                extra={
-                    "operation": operation,
-                    "request_id": request_id,
-                    "args": str(args),
-                    "kwargs": str(kwargs)
-                }
-            )
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(
+                    f"Handling {operation} request",
+                    extra={
+                        "operation": operation,
+                        "request_id": request_id,
+                        "call_args": CappedRepr(args),
+                        "call_kwargs": CappedRepr(kwargs)
+                    }
+                )
             
             result = await getattr(self.service, operation)(*args, **kwargs)
             
-            self.logger.info(
+            log_success(
+                self.logger,
                 f"Successfully handled {operation} request",
-                extra={
-                    "operation": operation,
-                    "request_id": request_id
-                }
+                (time.perf_counter() - start_time) * 1000,
+                operation=operation,
+                request_id=request_id
             )
             
             return format_response(result)
@@ -100,6 +106,36 @@ class BaseController(Generic[T]):
         """Search items"""
         return await self.handle_request('search', query, **kwargs)
 
+    async def stream(
+        self,
+        request: Request,
+        query: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> StreamingResponse:
+        """Stream all matching items as NDJSON, one item per line"""
+        self.logger.info(
+            "Handling stream request",
+            extra={
+                "operation": "stream",
+                "request_id": kwargs.get('request_id', 'unknown')
+            }
+        )
+        items = self.service.stream(query, **kwargs)
+        return StreamingResponse(self._ndjson(items), media_type="application/x-ndjson")
+
+    async def _ndjson(self, items: AsyncIterator[Any]) -> AsyncIterator[str]:
+        """Serialize items lazily so memory stays flat for large listings"""
+        try:
+            async for item in items:
+                if isinstance(item, BaseModel):
+                    yield item.model_dump_json() + "\n"
+                else:
+                    yield safe_json_dumps(item) + "\n"
+        except Exception as e:
+            # Headers are already sent; report the failure in-band
+            self.logger.error("Error while streaming items", exc_info=True, extra={"operation": "stream"})
+            yield safe_json_dumps({"error": str(e)}) + "\n"
+
     def validate_id(self, id: str) -> None:
         """Validate ID format"""
         if not id or not isinstance(id, str):
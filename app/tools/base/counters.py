@@ -0,0 +1,92 @@
+# app/tools/base/counters.py
+import asyncio
+import random
+import time
+from typing import Any, Optional, Union
+from google.api_core import exceptions as gcp_exceptions
+from google.cloud import firestore
+from app.core.config.settings import get_settings
+from app.core.logging.logging_config import logger
+from app.core.metrics.prometheus import observe_dependency, record_retry
+
+settings = get_settings()
+
+# Errors returned before the write is applied. Increments are not idempotent,
+# so ambiguous failures (DeadlineExceeded, Unavailable, Internal) are raised
+# rather than retried: the first write may have committed anyway.
+UNAPPLIED_ERRORS = (
+    gcp_exceptions.Aborted,
+    gcp_exceptions.ResourceExhausted
+)
+
+Number = Union[int, float]
+
+class ShardedCounter:
+    """
+    Counter spread over shard documents to sustain concurrent increments
+
+    Firestore handles about one sustained write per second per document, so
+    each increment goes to a random one of ``num_shards`` sub-documents.
+    Reads sum the shards with one aggregation query and are cached for
+    ``cache_ttl`` seconds; this process's own increments are applied to the
+    cached value immediately.
+    """
+
+    def __init__(
+        self,
+        doc_ref: Any,
+        num_shards: Optional[int] = None,
+        cache_ttl: Optional[float] = None
+    ):
+        self.doc_ref = doc_ref
+        self.num_shards = num_shards or settings.COUNTER_NUM_SHARDS
+        self.cache_ttl = settings.COUNTER_CACHE_TTL if cache_ttl is None else cache_ttl
+        self._shards = doc_ref.collection("shards")
+        self._value: Optional[Number] = None
+        self._fetched_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def increment(self, amount: Number = 1) -> None:
+        """Add amount (may be negative) to a random shard
+
+        Contention is retried once on another shard. Any other error is
+        raised, and the increment may or may not have been applied.
+        """
+        shards = random.sample(range(self.num_shards), min(2, self.num_shards))
+        for attempt, shard in enumerate(shards):
+            try:
+                async with observe_dependency("firestore", "counter_increment"):
+                    await self._shards.document(str(shard)).set(
+                        {"count": firestore.Increment(amount)},
+                        merge=True
+                    )
+                break
+            except UNAPPLIED_ERRORS as e:
+                # Contention on one shard; another shard is likely free
+                if attempt == len(shards) - 1:
+                    raise
+                logger.warning(f"Counter shard {shard} of {self.doc_ref.path} busy, retrying: {str(e)}")
+                record_retry("firestore", "counter_increment")
+
+        if self._value is not None:
+            self._value += amount
+
+    async def get(self) -> Number:
+        """Total across shards, served from cache when fresh"""
+        if self._fresh():
+            return self._value
+
+        # Concurrent readers share one aggregation query
+        async with self._lock:
+            if self._fresh():
+                return self._value
+
+            async with observe_dependency("firestore", "counter_read"):
+                results = await self._shards.sum("count", alias="total").get()
+            value = results[0][0].value if results and results[0] else 0
+            self._value = value or 0
+            self._fetched_at = time.monotonic()
+            return self._value
+
+    def _fresh(self) -> bool:
+        return self._value is not None and time.monotonic() - self._fetched_at < self.cache_ttl
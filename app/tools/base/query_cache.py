@@ -0,0 +1,140 @@
+# app/tools/base/query_cache.py
+import asyncio
+import hashlib
+import time
+from typing import Any, Dict, Optional, Tuple
+from cachetools import TTLCache
+from app.core.config.settings import get_settings
+from app.core.logging.logging_config import logger
+from app.core.metrics.prometheus import record_cache
+from app.infrastructure.database.redis.client import redis_client
+from app.shared.utils.serialization import dumps, loads
+
+settings = get_settings()
+
+class QueryCache:
+    """
+    Two-tier cache for repository reads with cross-node invalidation
+
+    Entries are keyed by collection, the collection's generation and the
+    normalized query. Writes bump the generation in Redis and announce it on
+    a pub/sub channel, so every node stops reading older entries at once.
+    Generations are re-read from Redis after QUERY_CACHE_LOCAL_TTL, which
+    bounds staleness if a message is missed.
+    """
+
+    def __init__(self):
+        self._local: TTLCache = TTLCache(maxsize=settings.QUERY_CACHE_SIZE, ttl=settings.QUERY_CACHE_LOCAL_TTL)
+        self._generations: Dict[str, Tuple[int, float]] = {}
+        self._channel = f"{settings.CACHE_PREFIX}query-cache"
+        self._task: Optional[asyncio.Task] = None
+
+    async def generation(self, collection: str) -> int:
+        """Current generation of a collection, refreshed from Redis when stale"""
+        cached = self._generations.get(collection)
+        if cached and time.monotonic() - cached[1] < settings.QUERY_CACHE_LOCAL_TTL:
+            return cached[0]
+
+        try:
+            generation = int(await redis_client.get(self._generation_key(collection)) or 0)
+        except Exception as e:
+            logger.warning(f"Query cache generation read failed for {collection}: {str(e)}")
+            generation = cached[0] if cached else 0
+
+        self._generations[collection] = (generation, time.monotonic())
+        return generation
+
+    async def get(self, collection: str, key: str) -> Tuple[bool, Any, int]:
+        """Returns (found, value, generation); None is a valid cached value
+
+        On a miss, pass the returned generation to ``set`` so a write that
+        lands while the value is loaded leaves it under the old generation.
+        """
+        generation = await self.generation(collection)
+        local_key = (collection, generation, key)
+        if local_key in self._local:
+            record_cache("query_local", True)
+            return True, self._local[local_key], generation
+        record_cache("query_local", False)
+
+        try:
+            payload = await redis_client.get(self._entry_key(collection, generation, key))
+        except Exception as e:
+            logger.warning(f"Query cache read failed for {collection}: {str(e)}")
+            return False, None, generation
+
+        record_cache("query_redis", payload is not None)
+        if payload is None:
+            return False, None, generation
+
+        value = loads(payload)
+        self._local[local_key] = value
+        return True, value, generation
+
+    async def set(self, collection: str, key: str, value: Any, ttl: int, generation: int) -> None:
+        """Store a value loaded while ``generation`` was current"""
+        self._local[(collection, generation, key)] = value
+        try:
+            await redis_client.set(self._entry_key(collection, generation, key), dumps(value), ttl=ttl)
+        except Exception as e:
+            logger.warning(f"Query cache write failed for {collection}: {str(e)}")
+
+    async def invalidate(self, collection: str) -> None:
+        """Retire every cached read of a collection on all nodes"""
+        current = self._generations.get(collection, (0, 0.0))[0]
+        # Bump locally first so this node never serves its own stale reads
+        self._generations[collection] = (current + 1, time.monotonic())
+
+        try:
+            async with redis_client.pipeline(transaction=True) as pipe:
+                pipe.incr(self._generation_key(collection))
+                pipe.expire(self._generation_key(collection), settings.QUERY_CACHE_GENERATION_TTL)
+                generation, _ = await pipe.execute()
+            generation = max(generation, current + 1)
+            self._generations[collection] = (generation, time.monotonic())
+            await redis_client.client.publish(self._channel, f"{collection}:{generation}")
+        except Exception as e:
+            logger.warning(f"Query cache invalidation failed for {collection}: {str(e)}")
+
+    def start(self) -> None:
+        """Subscribe to invalidations from other nodes"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen(), name="query-cache-invalidation")
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = redis_client.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self._channel)
+                async for message in pubsub.listen():
+                    collection, _, generation = message["data"].decode().rpartition(":")
+                    cached = self._generations.get(collection, (0, 0.0))[0]
+                    self._generations[collection] = (max(cached, int(generation)), time.monotonic())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Query cache subscription lost: {str(e)}")
+                # Anything published meanwhile was missed; re-read generations
+                self._generations.clear()
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    def _generation_key(self, collection: str) -> str:
+        return f"{settings.CACHE_PREFIX}query:{collection}:generation"
+
+    def _entry_key(self, collection: str, generation: int, key: str) -> str:
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return f"{settings.CACHE_PREFIX}query:{collection}:{generation}:{digest}"
+
+query_cache = QueryCache()
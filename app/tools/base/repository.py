@@ -1,34 +1,78 @@
-from typing import Any, Dict, Generic, List, Optional, TypeVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Generic, List, Optional, Tuple, TypeVar, Union
+from cachetools import LRUCache, TTLCache
 from pydantic import BaseModel
+from app.core.config.settings import get_settings
 from app.core.logging.logging_config import logger
+from app.core.metrics.prometheus import observe_dependency, record_cache
+from app.shared.exceptions.base import ValidationError
+from app.shared.utils.serialization import dumps_str
+from app.tools.base.counters import ShardedCounter
+from app.tools.base.bulk import BulkWriteError, BulkWriteResult, ChunkedBulkWriter, WriteOperation
+from app.tools.base.query_cache import query_cache
 from app.shared.utils.decorators.auth_decorator import log_execution
 
+settings = get_settings()
+
 T = TypeVar('T', bound=BaseModel)
 
+# Aggregate results shared by all repositories in the process. Keys include the
+# collection's query cache generation, which every write bumps on all nodes,
+# so stale totals are never read again and simply age out.
+_aggregate_cache: TTLCache = TTLCache(maxsize=settings.AGGREGATE_CACHE_SIZE, ttl=settings.AGGREGATE_CACHE_TTL)
+
+class Page(BaseModel):
+    """One page of results; pass next_cursor as start_after to continue"""
+    items: List[Any]
+    next_cursor: Optional[str] = None
+
 class BaseRepository(Generic[T]):
     """
     Base repository with common database operations
     
-    Generic type T should be a Pydantic model
+    Generic type T should be a Pydantic model; db should be a
+    ``firestore.AsyncClient`` such as ``async_db``. Pass ``cache_ttl`` to
+    cache get_by_id, get_all, search and exists results for that many seconds.
     """
     
-    def __init__(self, db: Any, collection_name: str):
+    def __init__(self, db: Any, collection_name: str, cache_ttl: int = 0):
         self.db = db
         self.collection_name = collection_name
+        self.cache_ttl = cache_ttl
         self.logger = logger
+        self._counters: LRUCache = LRUCache(maxsize=1024)
 
     @log_execution()
-    async def get_all(self, **kwargs) -> List[T]:
-        """Get all items from collection"""
-        collection = self.db.collection(self.collection_name)
-        docs = await collection.get()
-        return [self._to_model(doc.to_dict()) for doc in docs]
+    async def get_all(
+        self,
+        limit: Optional[int] = None,
+        start_after: Optional[str] = None,
+        order_by: Optional[str] = None,
+        select: Optional[List[str]] = None,
+        **kwargs
+    ) -> Page:
+        """Get one page of items from collection"""
+        return await self._get_page(None, limit, start_after, order_by, select)
 
     @log_execution()
     async def get_by_id(self, id: str, **kwargs) -> Optional[T]:
         """Get item by ID"""
-        doc = await self.db.collection(self.collection_name).document(id).get()
-        return self._to_model(doc.to_dict()) if doc.exists else None
+        async def load() -> Optional[Dict[str, Any]]:
+            async with observe_dependency("firestore", "get_by_id"):
+                doc = await self.db.collection(self.collection_name).document(id).get()
+            return doc.to_dict() if doc.exists else None
+
+        data = await self._cached(("get_by_id", id), load)
+        return self._to_model(data) if data is not None else None
+
+    @log_execution()
+    async def get_many(self, ids: List[str], **kwargs) -> List[Optional[T]]:
+        """Get items by ID in one round-trip, None for missing ones"""
+        collection = self.db.collection(self.collection_name)
+        refs = [collection.document(id) for id in dict.fromkeys(ids)]
+        async with observe_dependency("firestore", "get_many"):
+            docs = [doc async for doc in self.db.get_all(refs)]
+        found = {doc.id: self._to_model(doc.to_dict()) for doc in docs if doc.exists}
+        return [found.get(id) for id in ids]
 
     @log_execution()
     async def create(self, item: T, **kwargs) -> T:
@@ -36,7 +80,9 @@ class BaseRepository(Generic[T]):
         doc_ref = self.db.collection(self.collection_name).document()
         item_dict = item.dict()
         item_dict['id'] = doc_ref.id
-        await doc_ref.set(item_dict)
+        async with observe_dependency("firestore", "create"):
+            await doc_ref.set(item_dict)
+        await self._after_write()
         return self._to_model(item_dict)
 
     @log_execution()
@@ -44,87 +90,259 @@ class BaseRepository(Generic[T]):
         """Update existing item"""
         doc_ref = self.db.collection(self.collection_name).document(id)
         item_dict = item.dict(exclude={'id'})
-        await doc_ref.update(item_dict)
-        updated_doc = await doc_ref.get()
+        async with observe_dependency("firestore", "update"):
+            await doc_ref.update(item_dict)
+        await self._after_write()
+        async with observe_dependency("firestore", "get_by_id"):
+            updated_doc = await doc_ref.get()
         return self._to_model(updated_doc.to_dict())
 
     @log_execution()
     async def delete(self, id: str, **kwargs) -> bool:
         """Delete item"""
-        await self.db.collection(self.collection_name).document(id).delete()
+        async with observe_dependency("firestore", "delete"):
+            await self.db.collection(self.collection_name).document(id).delete()
+        await self._after_write()
         return True
 
     @log_execution()
-    async def bulk_create(self, items: List[T], **kwargs) -> List[T]:
-        """Bulk create items"""
-        batch = self.db.batch()
-        created_items = []
+    async def bulk_create(self, items: List[T], **kwargs) -> BulkWriteResult:
+        """Bulk create items, reporting failures per item"""
+        operations = []
+        item_dicts = []
         
-        for item in items:
+        for index, item in enumerate(items):
             doc_ref = self.db.collection(self.collection_name).document()
             item_dict = item.dict()
             item_dict['id'] = doc_ref.id
-            batch.set(doc_ref, item_dict)
-            created_items.append(self._to_model(item_dict))
+            operations.append(WriteOperation(index, doc_ref, "set", item_dict))
+            item_dicts.append(item_dict)
             
-        await batch.commit()
-        return created_items
+        errors = await ChunkedBulkWriter(self.db).write(operations)
+        await self._after_write()
+        return BulkWriteResult(
+            items=[self._to_model(item_dict) for index, item_dict in enumerate(item_dicts) if index not in errors],
+            errors=[
+                BulkWriteError(index=index, id=item_dicts[index]['id'], error=error)
+                for index, error in sorted(errors.items())
+            ]
+        )
 
     @log_execution()
-    async def bulk_update(self, items: List[Dict[str, Any]], **kwargs) -> List[T]:
-        """Bulk update items"""
-        batch = self.db.batch()
-        updated_items = []
+    async def bulk_update(self, items: List[Dict[str, Any]], **kwargs) -> BulkWriteResult:
+        """Bulk update items, reporting failures per item"""
+        operations = []
         
-        for item in items:
+        for index, item in enumerate(items):
             doc_ref = self.db.collection(self.collection_name).document(item['id'])
             update_data = {k: v for k, v in item.items() if k != 'id'}
-            batch.update(doc_ref, update_data)
+            operations.append(WriteOperation(index, doc_ref, "update", update_data))
             
-        await batch.commit()
+        errors = await ChunkedBulkWriter(self.db).write(operations)
+        await self._after_write()
         
         # Fetch updated documents
-        for item in items:
-            doc = await self.db.collection(self.collection_name).document(item['id']).get()
-            updated_items.append(self._to_model(doc.to_dict()))
-            
-        return updated_items
+        updated_ids = [item['id'] for index, item in enumerate(items) if index not in errors]
+        updated_items = await self.get_many(updated_ids)
+        return BulkWriteResult(
+            items=[item for item in updated_items if item is not None],
+            errors=[
+                BulkWriteError(index=index, id=items[index]['id'], error=error)
+                for index, error in sorted(errors.items())
+            ]
+        )
 
     @log_execution()
-    async def search(self, query: Dict[str, Any], **kwargs) -> List[T]:
-        """Search items based on query"""
+    async def search(
+        self,
+        query: Dict[str, Any],
+        limit: Optional[int] = None,
+        start_after: Optional[str] = None,
+        order_by: Optional[str] = None,
+        select: Optional[List[str]] = None,
+        **kwargs
+    ) -> Page:
+        """Search items based on query, one page at a time"""
+        return await self._get_page(query, limit, start_after, order_by, select)
+
+    async def stream(
+        self,
+        query: Optional[Dict[str, Any]] = None,
+        order_by: Optional[str] = None,
+        select: Optional[List[str]] = None,
+        **kwargs
+    ) -> AsyncIterator[Union[T, Dict[str, Any]]]:
+        """Yield every matching item without holding the result set in memory"""
+        async for doc in self._build_query(query, order_by, select).stream():
+            yield self._convert(doc.id, doc.to_dict(), select)
+
+    async def exists(self, id: str, **kwargs) -> bool:
+        """Check if item exists"""
+        async def load() -> bool:
+            async with observe_dependency("firestore", "exists"):
+                doc = await self.db.collection(self.collection_name).document(id).get()
+            return doc.exists
+
+        return await self._cached(("exists", id), load)
+
+    def counter(self, id: str, name: str, num_shards: Optional[int] = None) -> ShardedCounter:
+        """Sharded counter attached to an item, e.g. usage or popularity tallies
+
+        Counter objects are reused so their cached totals survive between calls.
+        """
+        key = (id, name)
+        counter = self._counters.get(key)
+        if counter is None:
+            doc_ref = (
+                self.db.collection(self.collection_name).document(id)
+                .collection("counters").document(name)
+            )
+            counter = ShardedCounter(doc_ref, num_shards=num_shards)
+            self._counters[key] = counter
+        return counter
+
+    async def count(self, query: Optional[Dict[str, Any]] = None, **kwargs) -> int:
+        """Count items matching query with a server-side aggregation"""
+        return await self._aggregate("count", None, query) or 0
+
+    async def sum(self, field: str, query: Optional[Dict[str, Any]] = None, **kwargs) -> Union[int, float]:
+        """Sum a numeric field over items matching query"""
+        return await self._aggregate("sum", field, query) or 0
+
+    async def avg(self, field: str, query: Optional[Dict[str, Any]] = None, **kwargs) -> Optional[float]:
+        """Average a numeric field over items matching query, None if nothing matches"""
+        return await self._aggregate("avg", field, query)
+
+    async def _aggregate(
+        self,
+        kind: str,
+        field: Optional[str],
+        query: Optional[Dict[str, Any]]
+    ) -> Optional[Union[int, float]]:
+        """Run a Firestore aggregation query, cached until the next write"""
+        cache_key = await self._aggregate_key(kind, field, query)
+        hit = cache_key in _aggregate_cache
+        record_cache("aggregate", hit)
+        if hit:
+            return _aggregate_cache[cache_key]
+
+        query_ref = self._build_query(query)
+        aggregation = query_ref.count(alias=kind) if kind == "count" else getattr(query_ref, kind)(field, alias=kind)
+        async with observe_dependency("firestore", kind):
+            results = await aggregation.get()
+        value = results[0][0].value if results and results[0] else None
+
+        _aggregate_cache[cache_key] = value
+        return value
+
+    async def _aggregate_key(self, kind: str, field: Optional[str], query: Optional[Dict[str, Any]]) -> Tuple:
+        """Cache key that treats equivalent filter spellings as one query"""
+        generation = await query_cache.generation(self.collection_name)
+        return (self.collection_name, generation, kind, field, self._normalize_query(query))
+
+    def _normalize_query(self, query: Optional[Dict[str, Any]]) -> str:
+        filters = {
+            name: value if isinstance(value, dict) else {'operator': '==', 'value': value}
+            for name, value in (query or {}).items()
+        }
+        return dumps_str(filters, sort_keys=True, default=str)
+
+    async def _cached(self, key: Tuple, load: Callable[[], Awaitable[Any]]) -> Any:
+        """Serve a read from the query cache when caching is enabled
+
+        Values must be JSON-serializable, so raw document data is cached
+        rather than models.
+        """
+        if not self.cache_ttl or not settings.ENABLE_CACHING:
+            return await load()
+
+        cache_key = dumps_str(key, default=str)
+        found, value, generation = await query_cache.get(self.collection_name, cache_key)
+        if found:
+            return value
+
+        value = await load()
+        await query_cache.set(self.collection_name, cache_key, value, self.cache_ttl, generation)
+        return value
+
+    async def _after_write(self) -> None:
+        """Retire cached reads and aggregates of this collection on all nodes"""
+        await query_cache.invalidate(self.collection_name)
+
+    def _build_query(
+        self,
+        query: Optional[Dict[str, Any]] = None,
+        order_by: Optional[str] = None,
+        select: Optional[List[str]] = None
+    ) -> Any:
+        """Build a Firestore query from filters, ordering and projection
+
+        ``order_by`` is a field name, prefixed with ``-`` for descending order.
+        """
         collection_ref = self.db.collection(self.collection_name)
-        
+
         # Apply filters from query
-        for field, value in query.items():
+        for field, value in (query or {}).items():
             if isinstance(value, dict):
                 operator = value.get('operator', '==')
                 collection_ref = collection_ref.where(field, operator, value.get('value'))
             else:
                 collection_ref = collection_ref.where(field, '==', value)
-                
-        docs = await collection_ref.get()
-        return [self._to_model(doc.to_dict()) for doc in docs]
 
-    async def exists(self, id: str, **kwargs) -> bool:
-        """Check if item exists"""
-        doc = await self.db.collection(self.collection_name).document(id).get()
-        return doc.exists
+        if order_by:
+            direction = "DESCENDING" if order_by.startswith('-') else "ASCENDING"
+            collection_ref = collection_ref.order_by(order_by.lstrip('-'), direction=direction)
 
-    async def count(self, query: Optional[Dict[str, Any]] = None, **kwargs) -> int:
-        """Count items matching query"""
-        collection_ref = self.db.collection(self.collection_name)
-        
-        if query:
-            for field, value in query.items():
-                if isinstance(value, dict):
-                    operator = value.get('operator', '==')
-                    collection_ref = collection_ref.where(field, operator, value.get('value'))
-                else:
-                    collection_ref = collection_ref.where(field, '==', value)
-                    
-        docs = await collection_ref.get()
-        return len(docs)
+        if select:
+            collection_ref = collection_ref.select(select)
+
+        return collection_ref
+
+    async def _get_page(
+        self,
+        query: Optional[Dict[str, Any]],
+        limit: Optional[int],
+        start_after: Optional[str],
+        order_by: Optional[str],
+        select: Optional[List[str]]
+    ) -> Page:
+        """Fetch one page, reading one extra document to detect the last page"""
+        limit = min(limit or settings.REPOSITORY_PAGE_SIZE, settings.REPOSITORY_MAX_PAGE_SIZE)
+
+        async def load() -> Dict[str, Any]:
+            query_ref = self._build_query(query, order_by, select)
+
+            if start_after:
+                async with observe_dependency("firestore", "get_cursor"):
+                    cursor = await self.db.collection(self.collection_name).document(start_after).get()
+                if not cursor.exists:
+                    raise ValidationError(f"Invalid cursor: {start_after}")
+                query_ref = query_ref.start_after(cursor)
+
+            async with observe_dependency("firestore", "query"):
+                docs = await query_ref.limit(limit + 1).get()
+            return {
+                "docs": [[doc.id, doc.to_dict()] for doc in docs[:limit]],
+                "next_cursor": docs[limit - 1].id if len(docs) > limit else None
+            }
+
+        key = ("page", self._normalize_query(query), limit, start_after, order_by, select)
+        page = await self._cached(key, load)
+        return Page(
+            items=[self._convert(id, data, select) for id, data in page["docs"]],
+            next_cursor=page["next_cursor"]
+        )
+
+    def _convert(
+        self,
+        id: str,
+        data: Dict[str, Any],
+        select: Optional[List[str]] = None
+    ) -> Union[T, Dict[str, Any]]:
+        """Projected documents are partial, so they are returned as dicts"""
+        if select:
+            return {'id': id, **data}
+        return self._to_model(data)
 
     def _to_model(self, data: Dict[str, Any]) -> T:
         """Convert dictionary to model instance"""
@@ -0,0 +1,74 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional
+from app.core.config.settings import get_settings
+from app.infrastructure.ai.huggingface.client import HuggingFaceClient
+from app.infrastructure.ai.onnx.client import OnnxCaptioningClient
+
+settings = get_settings()
+
+class CaptioningBackend(ABC):
+    """Produces a caption for raw image bytes"""
+
+    @property
+    @abstractmethod
+    def model_id(self) -> str:
+        """Identifier of the model behind this backend"""
+        pass
+
+    @abstractmethod
+    async def caption(self, image_bytes: bytes) -> str:
+        """Generate a caption for an image"""
+        pass
+
+    async def close(self) -> None:
+        """Release backend resources"""
+        pass
+
+class HostedCaptioningBackend(CaptioningBackend):
+    """Captions images through the Hugging Face Inference API"""
+
+    def __init__(self, model_id: Optional[str] = None):
+        self.client = HuggingFaceClient()
+        self._model_id = model_id or settings.IMAGE_CAPTIONING_MODEL
+
+    @property
+    def model_id(self) -> str:
+        return self._model_id
+
+    async def caption(self, image_bytes: bytes) -> str:
+        result = await self.client.query_model(self._model_id, image_bytes)
+
+        if not isinstance(result, list) or not result:
+            raise ValueError("Invalid response from model")
+
+        caption = result[0].get('generated_text')
+        if not caption:
+            raise ValueError("No caption generated")
+
+        return caption
+
+class LocalCaptioningBackend(CaptioningBackend):
+    """Captions images in-process with an ONNX model and dynamic batching"""
+
+    def __init__(self, model_dir: Optional[str] = None):
+        self.client = OnnxCaptioningClient(model_dir=model_dir)
+
+    @property
+    def model_id(self) -> str:
+        return f"onnx:{Path(self.client.model_dir).name}"
+
+    async def caption(self, image_bytes: bytes) -> str:
+        caption = await self.client.caption(image_bytes)
+        if not caption:
+            raise ValueError("No caption generated")
+        return caption
+
+    async def close(self) -> None:
+        await self.client.close()
+
+def get_captioning_backend() -> CaptioningBackend:
+    """Build the captioning backend selected by IMAGE_CAPTIONING_BACKEND"""
+    if settings.IMAGE_CAPTIONING_BACKEND == "local":
+        return LocalCaptioningBackend()
+    return HostedCaptioningBackend()
@@ -0,0 +1,73 @@
+import asyncio
+import io
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Union
+from PIL import Image, ImageOps
+from app.core.config.settings import get_settings
+
+settings = get_settings()
+
+def normalize_image(source: Union[bytes, str, Path], max_dimension: int, quality: int) -> bytes:
+    """
+    Decode, orient, downsize and re-encode an image as a compact JPEG
+
+    EXIF and other metadata are dropped because nothing is copied into the
+    re-encoded file. JPEG sources are decoded at reduced scale via ``draft``,
+    which avoids materialising the full-resolution bitmap. ``source`` may be
+    raw bytes or a path, in which case the file is read lazily by Pillow.
+    """
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    try:
+        with Image.open(source) as image:
+            image.draft("RGB", (max_dimension, max_dimension))
+            image = ImageOps.exif_transpose(image)
+
+            if image.mode in ("RGBA", "LA", "P"):
+                image = image.convert("RGBA")
+                background = Image.new("RGB", image.size, (255, 255, 255))
+                background.paste(image, mask=image.getchannel("A"))
+                image = background
+            elif image.mode != "RGB":
+                image = image.convert("RGB")
+
+            image.thumbnail((max_dimension, max_dimension), Image.Resampling.BICUBIC)
+
+            output = io.BytesIO()
+            image.save(output, format="JPEG", quality=quality, optimize=True)
+            return output.getvalue()
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        raise ValueError(f"Invalid image: {str(e)}")
+
+class ImagePreprocessor:
+    """Runs image normalization in a worker pool so decoding never blocks the event loop"""
+
+    def __init__(
+        self,
+        max_dimension: Optional[int] = None,
+        quality: Optional[int] = None,
+        max_workers: Optional[int] = None
+    ):
+        self.max_dimension = max_dimension or settings.IMAGE_MAX_DIMENSION
+        self.quality = quality or settings.IMAGE_JPEG_QUALITY
+        # Pillow releases the GIL while decoding and resampling, so threads scale here
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.IMAGE_PREPROCESS_WORKERS,
+            thread_name_prefix="image-preprocess"
+        )
+
+    async def normalize(self, source: Union[bytes, str, Path]) -> bytes:
+        """Normalize an image off the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            normalize_image,
+            source,
+            self.max_dimension,
+            self.quality
+        )
+
+    def close(self) -> None:
+        """Shut the worker pool down"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,8 +1,11 @@
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
-from app.core.security.firebase_auth import verify_firebase_token
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from app.core.security.session import verify_token
+from app.shared.utils.helpers.general_helpers import safe_json_dumps
 from .service import ImageCaptioningService
 from .schemas import ImageCaptioningResponse, ErrorResponse
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 router = APIRouter(prefix="/image-captioning", tags=["Image Captioning"])
 service = ImageCaptioningService()
@@ -27,8 +30,45 @@ service = ImageCaptioningService()
 )
 async def generate_caption(
     file: UploadFile = File(...),
-    token_data: Dict[str, Any] = Depends(verify_firebase_token)
+    token_data: Dict[str, Any] = Depends(verify_token)
 ):
     """Generate caption for an image"""
     result = await service.execute(file)
-    return ImageCaptioningResponse(**result)
\ No newline at end of file
+    return ImageCaptioningResponse(**result)
+
+@router.post(
+    "/batch",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "One JSON result per line, in completion order, including per-image errors",
+            "content": {
+                "application/x-ndjson": {
+                    "example": {
+                        "index": 0,
+                        "filename": "photo.jpg",
+                        "success": True,
+                        "caption": "a dog running on the beach",
+                        "file_path": "uploads/images/3a7bd3e2360a3d29eea436fcfb7e44c735d117c42d1c1835420b6b9942dd4f1b.jpg",
+                        "cached": False
+                    }
+                }
+            }
+        },
+        401: {
+            "description": "Unauthorized",
+            "model": ErrorResponse
+        }
+    }
+)
+async def generate_captions_batch(
+    files: List[UploadFile] = File(..., description="Images and/or ZIP archives of images"),
+    token_data: Dict[str, Any] = Depends(verify_token)
+):
+    """Generate captions for many images in one request, streamed as NDJSON"""
+    items = await service.prepare_batch(files)
+    return StreamingResponse(
+        (safe_json_dumps(result) + "\n" async for result in service.execute_batch(items)),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(service.discard_batch, items)
+    )
@@ -4,6 +4,7 @@ class ImageCaptioningResponse(BaseModel):
     success: bool
     caption: str
     file_path: str
+    cached: bool = False
 
 class ErrorResponse(BaseModel):
     error: str
\ No newline at end of file
@@ -1,52 +1,90 @@
 from app.tools.base.service import BaseToolService
-from app.infrastructure.ai.huggingface.client import HuggingFaceClient
 from fastapi import UploadFile, HTTPException
 from pathlib import Path
 import aiofiles
-import time
-from typing import Dict, Any
+import aiofiles.os
+import asyncio
+import hashlib
+import mimetypes
+import uuid
+import zipfile
+from typing import AsyncIterator, Awaitable, Callable, Dict, Any, List, NamedTuple, Optional
 from app.core.config.settings import get_settings
 from app.core.logging.logging_config import logger
+from app.core.metrics.prometheus import record_cache
+from app.infrastructure.database.redis.client import cache_data, get_cached_data
+from app.infrastructure.storage.base import StorageBackend, sharded_key
+from app.infrastructure.storage.provider import get_storage_backend
+from app.shared.exceptions.base import AppException
+from .backends import CaptioningBackend, get_captioning_backend
+from .preprocessing import ImagePreprocessor
 
 settings = get_settings()
 
+class IngestedUpload(NamedTuple):
+    """Upload streamed to a temporary file, not yet committed to its final name"""
+    temp_path: Path
+    file_hash: str
+    size: int
+
+class BatchItem(NamedTuple):
+    """One image of a batch request, either ingested or rejected during ingestion"""
+    index: int
+    filename: str
+    content_type: Optional[str]
+    upload: Optional[IngestedUpload] = None
+    error: Optional[str] = None
+    status_code: Optional[int] = None
+
 class ImageCaptioningService(BaseToolService):
     ALLOWED_MIME_TYPES = {'image/jpeg', 'image/png', 'image/jpg', 'image/webp'}
     MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+    MIME_EXTENSIONS = {'image/jpeg': '.jpg', 'image/jpg': '.jpg', 'image/png': '.png', 'image/webp': '.webp'}
+    ARCHIVE_MIME_TYPES = {'application/zip', 'application/x-zip-compressed'}
+    CHUNK_SIZE = 256 * 1024  # 256KB
+    # Encrypted members, unsupported compression, bad CRCs and truncated data
+    ARCHIVE_MEMBER_ERRORS = (RuntimeError, NotImplementedError, zipfile.BadZipFile, zipfile.LargeZipFile, EOFError, OSError)
 
-    def __init__(self):
+    def __init__(
+        self,
+        backend: Optional[CaptioningBackend] = None,
+        storage: Optional[StorageBackend] = None
+    ):
         super().__init__()
-        self.hf_client = HuggingFaceClient()
-        self.model_id = "Salesforce/blip-image-captioning-large"
-        self.upload_dir = Path(settings.UPLOAD_DIR) / "images"
-        self.upload_dir.mkdir(parents=True, exist_ok=True)
+        self.backend = backend or get_captioning_backend()
+        self.storage = storage or get_storage_backend("images")
+        self.preprocessor = ImagePreprocessor()
+        # Uploads are staged here before being handed to the storage backend
+        self.staging_dir = Path(settings.UPLOAD_DIR) / "staging"
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
 
     @property
     def tool_name(self) -> str:
         return "image_captioning"
 
+    @property
+    def model_id(self) -> str:
+        return self.backend.model_id
+
+    def start(self) -> None:
+        """Start background storage maintenance"""
+        self.storage.start()
+
+    async def close(self) -> None:
+        """Release captioning backend, storage and preprocessing resources"""
+        await self.backend.close()
+        await self.storage.close()
+        self.preprocessor.close()
+
     async def execute(self, file: UploadFile) -> Dict[str, Any]:
         """Execute image captioning on the uploaded file"""
         try:
             # Validate file
             await self._validate_file(file)
             
-            # Read file content once
-            image_bytes = await file.read()
-            
-            # Generate caption first
-            caption = await self._generate_caption(image_bytes)
-            
-            # Save file after successful caption generation
-            timestamp = int(time.time())
-            unique_filename = f"{timestamp}_{file.filename}"
-            file_path = await self._save_upload_file(unique_filename, image_bytes)
-            
-            return {
-                "success": True,
-                "caption": caption,
-                "file_path": str(file_path)
-            }
+            # Stream the upload to disk, hashing and enforcing the size limit as it arrives
+            upload = await self._ingest_stream(file.read)
+            return await self._caption_upload(upload, file.filename, file.content_type)
             
         except HTTPException:
             raise
@@ -57,50 +95,287 @@ class ImageCaptioningService(BaseToolService):
                 detail=str(e)
             )
 
+    async def prepare_batch(self, files: List[UploadFile]) -> List[BatchItem]:
+        """
+        Ingest every image of a batch request into temporary files
+
+        ZIP archives are expanded into one item per image. Rejected images become
+        items carrying an error, so they are reported without failing the batch.
+        This must complete before the response starts streaming because the
+        uploaded files are closed once the endpoint returns. If preparation
+        fails, temp files of items already ingested are removed.
+        """
+        items: List[BatchItem] = []
+        try:
+            for file in files:
+                if file.content_type in self.ARCHIVE_MIME_TYPES or (file.filename or "").lower().endswith(".zip"):
+                    await self._prepare_archive(file, items)
+                else:
+                    items.append(await self._prepare_item(
+                        len(items), file.filename, file.content_type, file.read, file.size
+                    ))
+        except BaseException:
+            await asyncio.shield(self.discard_batch(items))
+            raise
+        return items
+
+    async def execute_batch(self, items: List[BatchItem]) -> AsyncIterator[Dict[str, Any]]:
+        """Caption prepared batch items with bounded concurrency, yielding results as they complete"""
+        semaphore = asyncio.Semaphore(settings.IMAGE_CAPTIONING_BATCH_CONCURRENCY)
+
+        async def run(item: BatchItem) -> Dict[str, Any]:
+            if item.upload is None:
+                return self._batch_error(item, item.status_code, item.error)
+            async with semaphore:
+                try:
+                    result = await self._caption_upload(item.upload, item.filename, item.content_type)
+                    return {"index": item.index, "filename": item.filename, **result}
+                except HTTPException as e:
+                    return self._batch_error(item, e.status_code, str(e.detail))
+                except Exception as e:
+                    self.logger.error(f"Image captioning failed for {item.filename}: {str(e)}", exc_info=True)
+                    return self._batch_error(item, 500, str(e))
+
+        tasks = [asyncio.create_task(run(item)) for item in items]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            # The client may disconnect mid-stream; stop work and drop leftover temp files
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.discard_batch(items)
+
+    async def discard_batch(self, items: List[BatchItem]) -> None:
+        """Remove temporary files of batch items that were not committed"""
+        for item in items:
+            if item.upload is not None:
+                await self._discard_temp_file(item.upload.temp_path)
+
+    async def _prepare_archive(self, file: UploadFile, items: List[BatchItem]) -> None:
+        """Expand a ZIP upload into batch items, streaming each member to its own temp file"""
+        try:
+            archive = await asyncio.to_thread(zipfile.ZipFile, file.file)
+        except zipfile.BadZipFile:
+            items.append(BatchItem(len(items), file.filename, file.content_type, error="Invalid ZIP archive", status_code=400))
+            return
+
+        with archive:
+            for info in archive.infolist():
+                name = Path(info.filename).name
+                if info.is_dir() or not name or name.startswith(".") or info.filename.startswith("__MACOSX/"):
+                    continue
+
+                if len(items) >= settings.IMAGE_CAPTIONING_BATCH_MAX_ITEMS:
+                    # Report the overflow once rather than walking the rest of the archive
+                    items.append(BatchItem(
+                        len(items), file.filename, file.content_type,
+                        error=f"Batch limit of {settings.IMAGE_CAPTIONING_BATCH_MAX_ITEMS} images exceeded",
+                        status_code=413
+                    ))
+                    return
+
+                content_type = mimetypes.guess_type(name)[0]
+                try:
+                    member = await asyncio.to_thread(archive.open, info)
+                except self.ARCHIVE_MEMBER_ERRORS as e:
+                    items.append(BatchItem(len(items), name, content_type, error=f"Unreadable archive member: {str(e)}", status_code=400))
+                    continue
+
+                try:
+                    items.append(await self._prepare_item(
+                        len(items),
+                        name,
+                        content_type,
+                        lambda size: self._read_member(member, size),
+                        info.file_size
+                    ))
+                finally:
+                    member.close()
+
+    async def _read_member(self, member: Any, size: int) -> bytes:
+        """Read an archive member chunk; corrupt data becomes a client error"""
+        try:
+            return await asyncio.to_thread(member.read, size)
+        except self.ARCHIVE_MEMBER_ERRORS as e:
+            raise HTTPException(status_code=400, detail=f"Unreadable archive member: {str(e)}")
+
+    async def _prepare_item(
+        self,
+        index: int,
+        filename: str,
+        content_type: Optional[str],
+        read: Callable[[int], Awaitable[bytes]],
+        size: Optional[int]
+    ) -> BatchItem:
+        """Validate and ingest a single batch image, capturing rejections as item errors"""
+        try:
+            if index >= settings.IMAGE_CAPTIONING_BATCH_MAX_ITEMS:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Batch limit of {settings.IMAGE_CAPTIONING_BATCH_MAX_ITEMS} images exceeded"
+                )
+            self._validate_upload(content_type, size)
+            upload = await self._ingest_stream(read)
+            return BatchItem(index, filename, content_type, upload=upload)
+        except HTTPException as e:
+            return BatchItem(index, filename, content_type, error=str(e.detail), status_code=e.status_code)
+
+    def _batch_error(self, item: BatchItem, status_code: int, error: str) -> Dict[str, Any]:
+        return {
+            "index": item.index,
+            "filename": item.filename,
+            "success": False,
+            "status_code": status_code,
+            "error": error
+        }
+
+    async def _caption_upload(
+        self,
+        upload: IngestedUpload,
+        filename: Optional[str],
+        content_type: Optional[str]
+    ) -> Dict[str, Any]:
+        """Caption an ingested upload and commit it to its content-addressed name"""
+        try:
+            # Identical images were captioned before; skip the model call
+            caption = await self._get_cached_caption(upload.file_hash)
+            cached = caption is not None
+            if not cached:
+                caption = await self._generate_caption(await self._normalize_image(upload.temp_path))
+                await self._cache_caption(upload.file_hash, caption)
+            
+            # Keep the file after successful caption generation, stored once per content hash
+            file_path = await self._commit_upload(
+                upload,
+                self._content_key(upload.file_hash, filename, content_type),
+                content_type
+            )
+        finally:
+            await self._discard_temp_file(upload.temp_path)
+        
+        return {
+            "success": True,
+            "caption": caption,
+            "file_path": file_path,
+            "cached": cached
+        }
+
     async def _validate_file(self, file: UploadFile) -> None:
         """Validate uploaded file"""
-        if not file.content_type in self.ALLOWED_MIME_TYPES:
+        self._validate_upload(file.content_type, file.size)
+
+    def _validate_upload(self, content_type: Optional[str], size: Optional[int]) -> None:
+        """Validate content type and, when already known, size"""
+        if not content_type in self.ALLOWED_MIME_TYPES:
             raise HTTPException(
                 status_code=400,
                 detail=f"Invalid file type. Allowed types: {', '.join(self.ALLOWED_MIME_TYPES)}"
             )
 
-        # Check file size
-        file.file.seek(0, 2)
-        size = file.file.tell()
-        file.file.seek(0)
-        
-        if size > self.MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File size too large. Maximum size: {self.MAX_FILE_SIZE/1024/1024}MB"
-            )
+        # Reject early when the multipart parser already knows the size
+        if size is not None and size > self.MAX_FILE_SIZE:
+            self._raise_too_large()
+
+    def _raise_too_large(self) -> None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"File size too large. Maximum size: {self.MAX_FILE_SIZE/1024/1024}MB"
+        )
+
+    async def _ingest_stream(self, read: Callable[[int], Awaitable[bytes]]) -> IngestedUpload:
+        """Copy a stream to a temporary file in chunks, hashing it and enforcing MAX_FILE_SIZE"""
+        temp_path = self.staging_dir / f"{uuid.uuid4().hex}.part"
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            async with aiofiles.open(temp_path, 'wb') as out_file:
+                while chunk := await read(self.CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > self.MAX_FILE_SIZE:
+                        self._raise_too_large()
+                    digest.update(chunk)
+                    await out_file.write(chunk)
+        except HTTPException:
+            await self._discard_temp_file(temp_path)
+            raise
+        except Exception as e:
+            await self._discard_temp_file(temp_path)
+            self.logger.error(f"Failed to save file: {str(e)}")
+            raise HTTPException(status_code=500, detail="Failed to save file")
+
+        if size == 0:
+            await self._discard_temp_file(temp_path)
+            raise HTTPException(status_code=400, detail="Empty file")
 
-    async def _save_upload_file(self, filename: str, content: bytes) -> Path:
-        """Save file content to disk"""
-        file_path = self.upload_dir / filename
+        return IngestedUpload(temp_path=temp_path, file_hash=digest.hexdigest(), size=size)
+
+    def _content_key(self, file_hash: str, filename: Optional[str], content_type: Optional[str]) -> str:
+        """Build a sharded, content-addressed storage key keeping the original extension"""
+        extension = Path(filename or "").suffix.lower()
+        if not extension:
+            extension = self.MIME_EXTENSIONS.get(content_type, "")
+        return sharded_key(file_hash, extension)
+
+    def _caption_cache_key(self, file_hash: str) -> str:
+        return f"{settings.CACHE_PREFIX}caption:{self.model_id}:{file_hash}"
+
+    async def _get_cached_caption(self, file_hash: str) -> Optional[str]:
+        """Return a previously generated caption for this image, if any"""
+        if not settings.ENABLE_CACHING:
+            return None
+        try:
+            cached = await get_cached_data(self._caption_cache_key(file_hash))
+            record_cache("caption", cached is not None)
+            return cached.decode("utf-8") if cached else None
+        except Exception as e:
+            self.logger.warning(f"Caption cache lookup failed: {str(e)}")
+            return None
+
+    async def _cache_caption(self, file_hash: str, caption: str) -> None:
+        """Store a generated caption under the image content hash"""
+        if not settings.ENABLE_CACHING:
+            return
+        try:
+            await cache_data(self._caption_cache_key(file_hash), caption, settings.IMAGE_CAPTION_CACHE_TTL)
+        except Exception as e:
+            self.logger.warning(f"Caption cache write failed: {str(e)}")
+
+    async def _commit_upload(self, upload: IngestedUpload, key: str, content_type: Optional[str]) -> str:
+        """Hand the staged file to storage; identical content already stored is kept as is"""
         try:
-            async with aiofiles.open(file_path, 'wb') as out_file:
-                await out_file.write(content)
-            return file_path
+            return await self.storage.save_file(upload.temp_path, key, content_type)
         except Exception as e:
             self.logger.error(f"Failed to save file: {str(e)}")
             raise HTTPException(status_code=500, detail="Failed to save file")
 
+    async def _discard_temp_file(self, temp_path: Path) -> None:
+        try:
+            await aiofiles.os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+
+    async def _normalize_image(self, source: Path) -> bytes:
+        """Shrink and re-encode the image to the size the model actually uses"""
+        try:
+            return await self.preprocessor.normalize(source)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
     async def _generate_caption(self, image_bytes: bytes) -> str:
-        """Generate caption using HuggingFace model"""
+        """Generate caption using the configured captioning backend"""
         try:
-            result = await self.hf_client.query_model(self.model_id, image_bytes)
-            
-            if not isinstance(result, list) or not result:
-                raise ValueError("Invalid response from model")
-                
-            caption = result[0].get('generated_text')
-            if not caption:
-                raise ValueError("No caption generated")
-                
-            return caption
+            return await self.backend.caption(image_bytes)
             
+        except AppException as e:
+            self.logger.error(f"Caption generation failed: {e.message}")
+            retry_after = e.extra.get("retry_after")
+            raise HTTPException(
+                status_code=e.status_code,
+                detail=e.message,
+                headers={"Retry-After": str(retry_after)} if retry_after else None
+            )
         except Exception as e:
             self.logger.error(f"Caption generation failed: {str(e)}")
             raise HTTPException(
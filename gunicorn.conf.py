@@ -0,0 +1,22 @@
+# gunicorn.conf.py
+# Run with: PROMETHEUS_MULTIPROC_DIR=/tmp/prometheus gunicorn app.main:app -c gunicorn.conf.py
+import os
+import shutil
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("MAX_WORKERS", "4"))
+worker_class = "uvicorn.workers.UvicornWorker"
+keepalive = int(os.getenv("KEEP_ALIVE", "5"))
+
+def on_starting(server):
+    """Start every run with an empty metrics directory"""
+    metrics_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if metrics_dir:
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+        os.makedirs(metrics_dir, exist_ok=True)
+
+def child_exit(server, worker):
+    """Drop live gauges of workers that exited"""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
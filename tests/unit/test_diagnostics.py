@@ -0,0 +1,41 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import AsyncMock, patch
+from app.core.diagnostics.loop_monitor import LoopLagMonitor
+from app.core.diagnostics.profiler import SamplingProfiler
+
+def blocking_call():
+    time.sleep(0.5)
+
+class TestLoopLagMonitor(unittest.IsolatedAsyncioTestCase):
+
+    async def test_captures_blocking_stack(self):
+        monitor = LoopLagMonitor(interval_ms=20, threshold_ms=100)
+        with patch.object(monitor, "_publish", AsyncMock()) as publish:
+            monitor.start()
+            await asyncio.sleep(0.05)
+            blocking_call()
+            await asyncio.sleep(0.05)
+            await monitor.stop()
+
+        stalls = [stall for stall in monitor.stalls if stall["stack"]]
+        self.assertEqual(len(stalls), 1)
+        self.assertIn("blocking_call", stalls[0]["stack"])
+        self.assertGreaterEqual(stalls[0]["duration_ms"], 400)
+        publish.assert_any_await(stalls[0])
+
+class TestSamplingProfiler(unittest.TestCase):
+
+    def test_folded_stacks(self):
+        profiler = SamplingProfiler(threading.get_ident(), interval_ms=5)
+        profiler.start()
+        blocking_call()
+        profiler.stop()
+
+        self.assertGreater(profiler.samples, 0)
+        self.assertIn("blocking_call", profiler.folded()[0])
+
+if __name__ == '__main__':
+    unittest.main()
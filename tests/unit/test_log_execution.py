@@ -0,0 +1,42 @@
+import unittest
+from unittest.mock import patch
+from app.core.logging import policy
+from app.core.logging.logging_config import logger
+from app.shared.utils.decorators.auth_decorator import log_execution
+
+@log_execution(include_args=True)
+async def write_document(doc_id: str, data: dict) -> str:
+    return doc_id
+
+@log_execution(include_args=True)
+async def failing_write(doc_id: str) -> None:
+    raise ValueError("write failed")
+
+class TestLogExecution(unittest.IsolatedAsyncioTestCase):
+
+    async def test_sampled_success_is_logged(self):
+        with patch.object(policy.settings, "LOG_SUCCESS_SAMPLE_RATE", 1.0), \
+                self.assertLogs(logger, level="INFO") as logs:
+            result = await write_document("doc-1", {"name": "test"})
+
+        self.assertEqual(result, "doc-1")
+        record = logs.records[-1]
+        self.assertEqual(record.func_name, "write_document")
+        self.assertEqual(record.func_module, __name__)
+        self.assertIn("doc-1", str(record.call_args))
+
+    async def test_slow_success_is_logged(self):
+        with patch.object(policy.settings, "LOG_SLOW_CALL_MS", 0), \
+                self.assertLogs(logger, level="WARNING") as logs:
+            await write_document("doc-1", {})
+
+        self.assertTrue(logs.records[-1].getMessage().endswith("(slow)"))
+
+    async def test_error_is_logged_and_reraised(self):
+        with self.assertLogs(logger, level="ERROR") as logs, self.assertRaises(ValueError):
+            await failing_write("doc-1")
+
+        self.assertEqual(logs.records[-1].func_name, "failing_write")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import asyncio
+import unittest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from app.core.metrics.prometheus import observe_dependency
+from app.shared.middleware.metrics import metrics_middleware
+
+def sample(name: str, labels: dict) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+class TestMetricsMiddleware(unittest.TestCase):
+
+    def setUp(self):
+        app = FastAPI()
+        app.middleware("http")(metrics_middleware)
+
+        @app.get("/items/{item_id}")
+        async def get_item(item_id: str):
+            return {"id": item_id}
+
+        self.client = TestClient(app)
+
+    def test_labels_by_route_template(self):
+        labels = {"method": "GET", "route": "/items/{item_id}", "status": "200"}
+        before = sample("http_request_duration_seconds_count", labels)
+
+        self.client.get("/items/1")
+        self.client.get("/items/2")
+
+        self.assertEqual(sample("http_request_duration_seconds_count", labels) - before, 2)
+        self.assertEqual(sample("http_request_duration_seconds_count", {**labels, "route": "/items/1"}), 0)
+
+    def test_unmatched_paths_share_one_label(self):
+        labels = {"method": "GET", "route": "unmatched", "status": "404"}
+        before = sample("http_request_duration_seconds_count", labels)
+
+        self.client.get("/missing/1")
+        self.client.get("/missing/2")
+
+        self.assertEqual(sample("http_request_duration_seconds_count", labels) - before, 2)
+
+class TestObserveDependency(unittest.IsolatedAsyncioTestCase):
+
+    async def test_records_latency(self):
+        labels = {"dependency": "test", "operation": "fetch"}
+        count = sample("dependency_call_duration_seconds_count", labels)
+        total = sample("dependency_call_duration_seconds_sum", labels)
+
+        async with observe_dependency("test", "fetch"):
+            await asyncio.sleep(0.05)
+
+        self.assertEqual(sample("dependency_call_duration_seconds_count", labels) - count, 1)
+        self.assertGreaterEqual(sample("dependency_call_duration_seconds_sum", labels) - total, 0.05)
+
+    async def test_records_errors(self):
+        labels = {"dependency": "test", "operation": "store"}
+        errors = sample("dependency_errors_total", {**labels, "error": "ConnectionError"})
+        count = sample("dependency_call_duration_seconds_count", labels)
+
+        with self.assertRaises(ConnectionError):
+            async with observe_dependency("test", "store"):
+                raise ConnectionError("unreachable")
+
+        self.assertEqual(sample("dependency_errors_total", {**labels, "error": "ConnectionError"}) - errors, 1)
+        self.assertEqual(sample("dependency_call_duration_seconds_count", labels) - count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import json
+import unittest
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import uuid4
+from app.shared.utils.helpers.general_helpers import JSONEncoder
+from app.shared.utils.serialization import dumps, dumps_str, loads
+
+class TestSerialization(unittest.TestCase):
+
+    def test_matches_json_encoder(self):
+        data = {
+            "created_at": datetime(2023, 1, 1, 12, 30, 15, 123456),
+            "day": date(2023, 1, 1),
+            "id": uuid4(),
+            "payload": b"raw bytes",
+            "tags": ["a", "b"],
+            "count": 3
+        }
+        self.assertEqual(loads(dumps(data)), json.loads(json.dumps(data, cls=JSONEncoder)))
+
+    def test_sort_keys(self):
+        self.assertEqual(dumps_str({"b": 1, "a": 2}, sort_keys=True), '{"a":2,"b":1}')
+
+    def test_datetime_subclass(self):
+        class DatetimeWithNanoseconds(datetime):
+            pass
+
+        value = DatetimeWithNanoseconds(2023, 1, 1, 12, 30, 15, 123456)
+        self.assertEqual(loads(dumps({"updated_at": value})), {"updated_at": value.isoformat()})
+
+    def test_str_default(self):
+        self.assertEqual(loads(dumps({"value": Decimal("1.5")}, default=str)), {"value": "1.5"})
+
+    def test_unsupported_type(self):
+        with self.assertRaises(TypeError):
+            dumps({"value": object()})
+
+if __name__ == '__main__':
+    unittest.main()
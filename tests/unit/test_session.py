@@ -0,0 +1,45 @@
+import time
+import unittest
+from fastapi import HTTPException
+from app.core.config.settings import get_settings
+from app.core.security.session import (
+    ACCESS_TOKEN, REFRESH_TOKEN, create_session_tokens, decode_session_token
+)
+
+settings = get_settings()
+
+DAY = 86400
+
+class TestSessionTokens(unittest.TestCase):
+
+    def test_exchange_after_long_firebase_sign_in(self):
+        auth_time = int(time.time()) - (settings.SESSION_MAX_AGE_DAYS + 10) * DAY
+        tokens = create_session_tokens({"uid": "user-1", "email": "user@example.com", "auth_time": auth_time})
+
+        self.assertEqual(tokens["expires_in"], settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+        access = decode_session_token(tokens["access_token"], ACCESS_TOKEN)
+        refresh = decode_session_token(tokens["refresh_token"], REFRESH_TOKEN)
+        self.assertEqual(access["auth_time"], auth_time)
+        self.assertAlmostEqual(refresh["sid_iat"], time.time(), delta=5)
+        self.assertEqual(access["exp"] - access["iat"], tokens["expires_in"])
+
+    def test_refresh_cannot_extend_session(self):
+        session_end_in = 60
+        started = int(time.time()) - settings.SESSION_MAX_AGE_DAYS * DAY + session_end_in
+        tokens = create_session_tokens({"uid": "user-1"}, session_started_at=started)
+
+        self.assertLessEqual(tokens["expires_in"], session_end_in)
+        refresh = decode_session_token(tokens["refresh_token"], REFRESH_TOKEN)
+        self.assertEqual(refresh["sid_iat"], started)
+        self.assertLessEqual(refresh["exp"], started + settings.SESSION_MAX_AGE_DAYS * DAY)
+
+    def test_expired_session_is_rejected(self):
+        started = int(time.time()) - (settings.SESSION_MAX_AGE_DAYS + 1) * DAY
+        tokens = create_session_tokens({"uid": "user-1"}, session_started_at=started)
+
+        with self.assertRaises(HTTPException) as raised:
+            decode_session_token(tokens["refresh_token"], REFRESH_TOKEN)
+        self.assertEqual(raised.exception.status_code, 401)
+
+if __name__ == '__main__':
+    unittest.main()
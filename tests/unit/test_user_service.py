@@ -1,36 +1,101 @@
 import unittest
-from unittest.mock import patch
-from app.services.user_service import get_user, update_user, delete_user
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.services import user_service
+from app.services.user_service import get_user, get_users, update_user, delete_user
 
-class TestUserService(unittest.TestCase):
+USER_DATA = {
+    "id": "user123",
+    "email": "test@example.com",
+    "name": "Test User",
+    "created_at": "2023-01-01",
+    "updated_at": "2023-01-01"
+}
 
-    @patch('app.services.user_service.get_cached_data')
-    @patch('app.services.user_service.db.collection')
-    def test_get_user(self, mock_db_collection, mock_get_cached_data):
+def _snapshot(id, data=None):
+    snapshot = MagicMock(id=id, exists=data is not None)
+    snapshot.to_dict.return_value = data
+    return snapshot
+
+class TestUserService(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        user_service._local_cache.clear()
+
+    @patch('app.services.user_service.redis_client')
+    @patch('app.services.user_service.async_db')
+    async def test_get_user(self, mock_db, mock_redis):
         # Mock Firestore and Redis responses
-        mock_get_cached_data.return_value = None
-        mock_db_collection.return_value.document.return_value.get.return_value.to_dict.return_value = {
-            "id": "user123",
-            "email": "test@example.com",
-            "name": "Test User",
-            "created_at": "2023-01-01",
-            "updated_at": "2023-01-01"
-        }
-        
-        user = get_user("user123")
+        mock_redis.get = AsyncMock(return_value=None)
+        mock_redis.set_many = AsyncMock()
+        document = mock_db.collection.return_value.document.return_value
+        document.get = AsyncMock(return_value=_snapshot("user123", USER_DATA))
+
+        user = await get_user("user123")
         self.assertIsNotNone(user)
         self.assertEqual(user.id, "user123")
 
-    @patch('app.services.user_service.db.collection')
-    def test_update_user(self, mock_db_collection):
+        # Second read is served from the in-process cache
+        await get_user("user123")
+        document.get.assert_awaited_once()
+        mock_redis.get.assert_awaited_once()
+
+    @patch('app.services.user_service.redis_client')
+    @patch('app.services.user_service.async_db')
+    async def test_get_user_from_redis(self, mock_db, mock_redis):
+        mock_redis.get = AsyncMock(return_value=user_service.User(**USER_DATA).model_dump_json().encode())
+
+        user = await get_user("user123")
+        self.assertEqual(user.email, "test@example.com")
+        mock_db.collection.assert_not_called()
+
+    @patch('app.services.user_service.redis_client')
+    @patch('app.services.user_service.async_db')
+    async def test_get_missing_user(self, mock_db, mock_redis):
+        mock_redis.get = AsyncMock(return_value=None)
+        mock_redis.set_many = AsyncMock()
+        document = mock_db.collection.return_value.document.return_value
+        document.get = AsyncMock(return_value=_snapshot("missing"))
+
+        self.assertIsNone(await get_user("missing"))
+        self.assertIsNone(await get_user("missing"))
+        document.get.assert_awaited_once()
+
+    @patch('app.services.user_service.redis_client')
+    @patch('app.services.user_service.async_db')
+    async def test_get_users(self, mock_db, mock_redis):
+        mock_redis.get_many = AsyncMock(return_value=[None, None])
+        mock_redis.set_many = AsyncMock()
+
+        async def get_all(refs):
+            yield _snapshot("user123", USER_DATA)
+            yield _snapshot("missing")
+        mock_db.get_all = get_all
+
+        users = await get_users(["user123", "missing"])
+        self.assertEqual(users["user123"].id, "user123")
+        self.assertIsNone(users["missing"])
+        self.assertEqual(mock_redis.set_many.await_count, 2)
+
+    @patch('app.services.user_service.redis_client')
+    @patch('app.services.user_service.async_db')
+    async def test_update_user(self, mock_db, mock_redis):
+        mock_redis.delete = AsyncMock()
+        document = mock_db.collection.return_value.document.return_value
+        document.update = AsyncMock()
         user_data = {"name": "Updated User"}
-        update_user("user123", user_data)
-        mock_db_collection.return_value.document.return_value.update.assert_called_with(user_data)
+        await update_user("user123", user_data)
+        document.update.assert_awaited_with(user_data)
+        mock_redis.delete.assert_awaited_once()
 
-    @patch('app.services.user_service.db.collection')
-    def test_delete_user(self, mock_db_collection):
-        delete_user("user123")
-        mock_db_collection.return_value.document.return_value.delete.assert_called_once()
+    @patch('app.services.user_service.redis_client')
+    @patch('app.services.user_service.async_db')
+    async def test_delete_user(self, mock_db, mock_redis):
+        mock_redis.delete = AsyncMock()
+        document = mock_db.collection.return_value.document.return_value
+        document.delete = AsyncMock()
+        await delete_user("user123")
+        document.delete.assert_awaited_once()
+        mock_redis.delete.assert_awaited_once()
 
 if __name__ == '__main__':
     unittest.main()